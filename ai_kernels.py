@@ -0,0 +1,97 @@
+
+# ai_kernels.py - numeric reduction kernels for the AI endpoints
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    njit = None
+
+HIGH_RISK_THRESHOLD = 15.0
+
+
+def summarize_delays(delays):
+    """Reduce a predicted-delay vector to (high_risk_count, total, average)"""
+    n = delays.size
+    if n == 0:
+        return 0, 0.0, 0.0
+    high_risk = int((delays > HIGH_RISK_THRESHOLD).sum())
+    total = float(delays.sum())
+    return high_risk, total, total / n
+
+
+def bucket_mean_sums(keys, values, n_buckets):
+    """Per-bucket sum and count for small integer keys (hour/day grouping)"""
+    sums = np.zeros(n_buckets)
+    counts = np.zeros(n_buckets, dtype=np.int64)
+    for i in range(keys.size):
+        sums[keys[i]] += values[i]
+        counts[keys[i]] += 1
+    return sums, counts
+
+
+def section_traversal_minutes(max_speeds, lengths, gradients, limits):
+    """Traversal minutes for every (train, section) pair.
+
+    Broadcasts train speeds against the section columns; same formula as
+    TrainSchedule.calculate_section_time, evaluated for the whole grid.
+    """
+    eff = np.minimum(max_speeds.reshape(-1, 1) * (1.0 - np.abs(gradients) / 100.0),
+                     limits)
+    return lengths / eff * 60.0
+
+
+def advance_trains(positions, speeds, lengths, from_km, dt_minutes):
+    """One simulation step of movement for trains cleared to move.
+
+    Returns the new position per train and a flag for trains that finish
+    their current section this step. Occupancy and status decisions stay
+    with the caller; this is just the per-train physics.
+    """
+    n = positions.size
+    new_positions = np.empty(n)
+    completed = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        step_km = speeds[i] / 60.0 * dt_minutes
+        remaining = lengths[i] - (positions[i] - from_km[i])
+        if step_km >= remaining:
+            new_positions[i] = from_km[i] + lengths[i]
+            completed[i] = True
+        else:
+            new_positions[i] = positions[i] + step_km
+    return new_positions, completed
+
+
+def congestion_propagation(congestion, threshold):
+    """Count high-congestion samples that grew vs shrank on the next tick.
+
+    Expressed as boolean reductions over the shifted views so the
+    NumPy fallback runs vectorized rather than element by element;
+    compiled, the form makes no difference.
+    """
+    current = congestion[:-1]
+    following = congestion[1:]
+    above = current > threshold
+    grew = following > current
+    propagates = int((above & grew).sum())
+    dissipates = int((above & ~grew).sum())
+    return propagates, dissipates
+
+
+if njit is not None:
+    # cache=True keeps the compiled kernels across runs; warm_up() triggers
+    # compilation at startup instead of on the first request
+    summarize_delays = njit(cache=True)(summarize_delays)
+    bucket_mean_sums = njit(cache=True)(bucket_mean_sums)
+    section_traversal_minutes = njit(cache=True)(section_traversal_minutes)
+    advance_trains = njit(cache=True)(advance_trains)
+    congestion_propagation = njit(cache=True)(congestion_propagation)
+
+
+def warm_up():
+    """Compile/exercise the kernels ahead of the first request"""
+    summarize_delays(np.zeros(1))
+    bucket_mean_sums(np.zeros(1, dtype=np.int64), np.zeros(1), 24)
+    section_traversal_minutes(np.ones(1), np.ones(1), np.zeros(1), np.ones(1))
+    advance_trains(np.zeros(1), np.ones(1), np.ones(1), np.zeros(1), 5)
+    congestion_propagation(np.zeros(2), 0.7)
@@ -1,521 +1,675 @@
-# app_enhanced_live.py - Enhanced Flask Application with Live Database Integration
-from flask import Flask, jsonify, request, render_template
-from flask_cors import CORS
-import datetime
-import json
-import threading
-import time
-from live_database import charbagh_db
-from dynamic_optimizer import dynamic_optimizer
-from ml_predictor import TrainDelayPredictor
-from time_series_analyzer import RailwayTimeSeriesAnalyzer
-
-app = Flask(__name__)
-CORS(app)
-
-# Global instances
-ml_predictor = TrainDelayPredictor()
-time_series_analyzer = RailwayTimeSeriesAnalyzer()
-
-# Start live database updates
-charbagh_db.start_live_updates()
-
-@app.route('/')
-def index():
-    """Main dashboard"""
-    return render_template('dashboard_pro.html')
-
-@app.route('/ai-engine')
-def ai_engine_page():
-    """AI Engine page with enhanced features"""
-    return render_template('ai_engine.html')
-
-@app.route('/analytics')
-def analytics_page():
-    """Enhanced analytics page with comprehensive KPIs"""
-    return render_template('analytics.html')
-
-@app.route('/section-control')
-def section_control_page():
-    """Section control page with live platform data"""
-    return render_template('section_control.html')
-
-@app.route('/train-records')
-def train_records_page():
-    """Train records with live database"""
-    return render_template('train_records.html')
-
-# ==================== ENHANCED API ENDPOINTS ====================
-
-@app.route('/api/live-network-status', methods=['GET'])
-def get_live_network_status():
-    """Get comprehensive live network status with all metrics"""
-    try:
-        # Get live data from database
-        trains = charbagh_db.get_live_train_data()
-        platform_status = charbagh_db.get_platform_status()
-        performance_metrics = charbagh_db.get_performance_metrics()
-        conflicts = charbagh_db.detect_conflicts()
-        analytics_data = charbagh_db.get_analytics_data()
-        
-        # Current trains by status
-        current_trains = {
-            'scheduled': [t for t in trains if t['current_status'] == 'Scheduled'],
-            'delayed': [t for t in trains if t['current_status'] == 'Delayed'],
-            'at_platform': [t for t in trains if t['current_status'] == 'At Platform'],
-            'departed': [t for t in trains if t['current_status'] == 'Departed']
-        }
-        
-        # Enhanced KPIs - use recent trains (last 2 days) for better data coverage
-        recent_date = datetime.date.today() - datetime.timedelta(days=1)
-        total_trains_today = len([t for t in trains if datetime.datetime.fromisoformat(t['scheduled_arrival']).date() >= recent_date])
-        
-        enhanced_status = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'system_status': 'OPERATIONAL',
-            'live_database_active': True,
-            'total_trains_in_system': len(trains),
-            'trains_recent': total_trains_today,
-            'platforms_operational': len([p for p in platform_status if p['maintenance_status'] == 'Operational']),
-            
-            # Live train status
-            'current_trains': current_trains,
-            'platform_status': platform_status,
-            
-            # Performance metrics
-            'performance': performance_metrics,
-            
-            # Conflicts and issues
-            'conflicts': conflicts,
-            'critical_alerts': len([c for c in conflicts if c['severity'] == 'High']),
-            
-            # Analytics data
-            'analytics': analytics_data,
-            
-            # Enhanced KPIs
-            'kpis': {
-                'punctuality_rate': round((performance_metrics.get('on_time_trains', 0) / max(performance_metrics.get('total_trains', 1), 1)) * 100, 1),
-                'platform_utilization': round(performance_metrics.get('platform_utilization', 0), 1),
-                'avg_delay_minutes': round(performance_metrics.get('avg_delay_minutes', 0), 1),
-                'passenger_satisfaction': round(performance_metrics.get('passenger_satisfaction', 0), 1),
-                'system_efficiency': round(performance_metrics.get('system_efficiency', 0), 1),
-                'conflicts_active': len(conflicts),
-                'trains_per_hour': round(total_trains_today / 48, 2),  # Divided by 48 hours for 2-day span
-                'delay_trend': 'improving' if performance_metrics.get('avg_delay_minutes', 0) < 15 else 'concerning'
-            }
-        }
-        
-        return jsonify(enhanced_status)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/dynamic-optimize', methods=['POST'])
-def run_dynamic_optimization():
-    """Run dynamic optimization with varying results"""
-    try:
-        result = dynamic_optimizer.run_optimization()
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/what-if-scenario', methods=['POST'])
-def run_what_if_scenario():
-    """Run what-if scenario with dynamic results"""
-    try:
-        data = request.json or {}
-        result = dynamic_optimizer.run_what_if_scenario(data)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/schedule-reoptimize', methods=['POST'])
-def schedule_reoptimization():
-    """Dynamic schedule reoptimization"""
-    try:
-        # Get reoptimization parameters
-        data = request.json or {}
-        reoptimize_type = data.get('type', 'full')  # full, partial, emergency
-        priority_trains = data.get('priority_trains', [])
-        
-        # Run reoptimization
-        result = dynamic_optimizer.run_optimization()
-        
-        # Add reoptimization-specific data
-        reoptimization_result = {
-            'reoptimization_id': f"REOPT_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            'type': reoptimize_type,
-            'triggered_at': datetime.datetime.now().isoformat(),
-            'reason': data.get('reason', 'Manual reoptimization requested'),
-            'priority_trains_considered': priority_trains,
-            'optimization_result': result,
-            'changes_applied': {
-                'platform_reassignments': len(result.get('detailed_results', {}).get('platform_assignments', {})),
-                'schedule_adjustments': len(result.get('detailed_results', {}).get('schedule_adjustments', {})),
-                'conflicts_resolved': result.get('conflicts_resolved', 0)
-            },
-            'next_reoptimization_recommended': (datetime.datetime.now() + datetime.timedelta(minutes=30)).isoformat()
-        }
-        
-        return jsonify(reoptimization_result)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/conflict-detection', methods=['GET'])
-def get_conflict_detection():
-    """Get comprehensive conflict detection with ML predictions"""
-    try:
-        conflicts = charbagh_db.detect_conflicts()
-        trains = charbagh_db.get_live_train_data()
-        
-        # Enhanced conflict analysis
-        conflict_analysis = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'total_conflicts': len(conflicts),
-            'conflicts_by_severity': {
-                'high': len([c for c in conflicts if c['severity'] == 'High']),
-                'medium': len([c for c in conflicts if c['severity'] == 'Medium']),
-                'low': len([c for c in conflicts if c['severity'] == 'Low'])
-            },
-            'conflicts_by_type': {
-                'platform': len([c for c in conflicts if c['type'] == 'Platform Conflict']),
-                'schedule': len([c for c in conflicts if c['type'] == 'Schedule Conflict']),
-                'resource': len([c for c in conflicts if c['type'] == 'Resource Conflict'])
-            },
-            'detailed_conflicts': conflicts,
-            'predictive_analysis': {
-                'probability_new_conflicts_next_hour': min(len(conflicts) * 15, 85),
-                'critical_time_windows': ['08:00-09:30', '17:30-19:00', '21:00-22:30'],
-                'high_risk_platforms': [c['platform'] for c in conflicts if c['severity'] == 'High']
-            },
-            'resolution_suggestions': [
-                f"Immediate attention required for {len([c for c in conflicts if c['severity'] == 'High'])} high-severity conflicts",
-                "Consider implementing dynamic platform allocation for peak hours",
-                f"Monitor platforms {list(set([c['platform'] for c in conflicts]))} for continued conflicts"
-            ]
-        }
-        
-        return jsonify(conflict_analysis)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/comprehensive-analytics', methods=['GET'])
-def get_comprehensive_analytics():
-    """Get comprehensive analytics with multiple KPIs"""
-    try:
-        # Get data from various sources
-        trains = charbagh_db.get_live_train_data()
-        performance_metrics = charbagh_db.get_performance_metrics()
-        analytics_data = charbagh_db.get_analytics_data()
-        platform_status = charbagh_db.get_platform_status()
-        
-        # Calculate comprehensive KPIs - use recent trains for better data coverage
-        recent_date = datetime.date.today() - datetime.timedelta(days=1)
-        today_trains = [t for t in trains if datetime.datetime.fromisoformat(t['scheduled_arrival']).date() >= recent_date]
-        
-        comprehensive_analytics = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'summary_kpis': {
-                'total_trains_managed': len(trains),
-                'trains_recent': len(today_trains),
-                'punctuality_rate': round((performance_metrics.get('on_time_trains', 0) / max(performance_metrics.get('total_trains', 1), 1)) * 100, 1),
-                'average_delay': round(performance_metrics.get('avg_delay_minutes', 0), 1),
-                'platform_utilization': round(performance_metrics.get('platform_utilization', 0), 1),
-                'system_efficiency': round(performance_metrics.get('system_efficiency', 0), 1),
-                'passenger_satisfaction': round(performance_metrics.get('passenger_satisfaction', 0), 1)
-            },
-            
-            'operational_kpis': {
-                'trains_per_hour': round(len(today_trains) / 48, 2),  # 48 hours for 2-day span
-                'peak_hour_capacity': max([item['trains'] for item in analytics_data.get('hourly_traffic', [{'trains': 0}])]),
-                'platform_efficiency': {f"Platform_{i}": round(85 + (i * 2.3), 1) for i in range(1, 10)},
-                'delay_distribution': {
-                    'on_time': len([t for t in today_trains if t['delay_minutes'] == 0]),
-                    'minor_delay_5_15min': len([t for t in today_trains if 0 < t['delay_minutes'] <= 15]),
-                    'moderate_delay_15_30min': len([t for t in today_trains if 15 < t['delay_minutes'] <= 30]),
-                    'major_delay_30min_plus': len([t for t in today_trains if t['delay_minutes'] > 30])
-                },
-                'train_type_performance': analytics_data.get('train_type_analytics', [])
-            },
-            
-            'financial_kpis': {
-                'estimated_delay_cost_inr': sum(t['delay_minutes'] * 800 for t in today_trains),
-                'operational_efficiency_savings': 45000,  # Estimated daily savings
-                'passenger_compensation_liability': sum(max(0, (t['delay_minutes'] - 30) * 50) for t in today_trains),
-                'resource_utilization_value': 127500
-            },
-            
-            'quality_kpis': {
-                'service_reliability': round(95.2 - (performance_metrics.get('avg_delay_minutes', 0) * 0.8), 1),
-                'customer_experience_score': round(performance_metrics.get('passenger_satisfaction', 0), 1),
-                'safety_compliance': 99.8,
-                'environmental_efficiency': 87.3,
-                'staff_productivity': 91.5
-            },
-            
-            'predictive_kpis': {
-                'next_hour_delay_probability': min(performance_metrics.get('avg_delay_minutes', 0) * 3.5, 75),
-                'congestion_forecast': 'moderate' if len(today_trains) < 150 else 'high',
-                'maintenance_window_availability': '14:30-16:00',
-                'optimal_scheduling_score': round(82.5 + (performance_metrics.get('system_efficiency', 0) * 0.15), 1)
-            },
-            
-            'detailed_analytics': analytics_data,
-            'platform_status': platform_status,
-            'trend_analysis': {
-                'punctuality_trend': 'improving',
-                'delay_trend': 'stable',
-                'efficiency_trend': 'improving',
-                'passenger_satisfaction_trend': 'stable'
-            }
-        }
-        
-        return jsonify(comprehensive_analytics)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/ml-predictions', methods=['GET'])
-def get_ml_predictions():
-    """Get ML predictions for current trains"""
-    try:
-        trains = charbagh_db.get_live_train_data()
-        current_trains = [t for t in trains if t['current_status'] in ['Scheduled', 'Delayed', 'At Platform']]
-        
-        predictions = {}
-        current_time = datetime.datetime.now()
-        
-        for train in current_trains[:15]:  # Limit to 15 trains for performance
-            try:
-                predicted_delay = ml_predictor.predict_delay(
-                    hour_of_day=current_time.hour,
-                    day_of_week=current_time.weekday(),
-                    weather_score=0.8,
-                    section_congestion=0.6,
-                    train_priority=train['priority'],
-                    base_speed=train['max_speed']
-                )
-                
-                risk_level = ml_predictor.get_risk_assessment(predicted_delay)
-                
-                predictions[train['train_number']] = {
-                    'train_name': train['train_name'],
-                    'predicted_delay_minutes': round(predicted_delay, 1),
-                    'current_delay': train['delay_minutes'],
-                    'risk_level': risk_level,
-                    'confidence': 0.85,
-                    'platform': train['platform_number'],
-                    'recommendation': f"Monitor closely - {risk_level} risk" if risk_level != "LOW" else "Normal monitoring"
-                }
-            except:
-                continue
-        
-        return jsonify({
-            'timestamp': datetime.datetime.now().isoformat(),
-            'predictions': predictions,
-            'summary': {
-                'total_predictions': len(predictions),
-                'high_risk_trains': len([p for p in predictions.values() if p['risk_level'] == 'HIGH']),
-                'medium_risk_trains': len([p for p in predictions.values() if p['risk_level'] == 'MEDIUM']),
-                'low_risk_trains': len([p for p in predictions.values() if p['risk_level'] == 'LOW'])
-            },
-            'model_info': {
-                'type': 'Linear Regression',
-                'accuracy': '85%',
-                'last_updated': current_time.isoformat()
-            }
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/platform-management', methods=['GET'])
-def get_platform_management():
-    """Get comprehensive platform management data"""
-    try:
-        platform_status = charbagh_db.get_platform_status()
-        trains = charbagh_db.get_live_train_data()
-        
-        # Enhanced platform information
-        platform_management = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'total_platforms': 9,
-            'platforms': []
-        }
-        
-        for platform in platform_status:
-            platform_trains = [t for t in trains if t['platform_number'] == platform['platform_number']]
-            recent_date = datetime.date.today() - datetime.timedelta(days=1)
-            today_trains = [t for t in platform_trains if datetime.datetime.fromisoformat(t['scheduled_arrival']).date() >= recent_date]
-            
-            platform_info = {
-                'platform_number': platform['platform_number'],
-                'current_status': platform['status'],
-                'maintenance_status': platform['maintenance_status'],
-                'current_train': platform['current_train'],
-                'current_train_name': platform.get('train_name'),
-                'next_departure': platform.get('scheduled_departure'),
-                'trains_recent': len(today_trains),
-                'utilization_percentage': min(len(today_trains) * 2.1, 100),  # Adjusted for 2-day span
-                'avg_delay_recent': round(sum(t['delay_minutes'] for t in today_trains) / max(len(today_trains), 1), 1),
-                'capacity_status': 'optimal' if len(today_trains) < 40 else 'high',  # Adjusted for 2-day span
-                'next_available_slot': (datetime.datetime.now() + datetime.timedelta(hours=2, minutes=15)).isoformat()
-            }
-            platform_management['platforms'].append(platform_info)
-        
-        # Summary statistics
-        platform_management['summary'] = {
-            'occupied_platforms': len([p for p in platform_status if p['status'] == 'Occupied']),
-            'available_platforms': len([p for p in platform_status if p['status'] == 'Available']),
-            'maintenance_platforms': len([p for p in platform_status if p['maintenance_status'] != 'Operational']),
-            'avg_utilization': round(sum(p['utilization_percentage'] for p in platform_management['platforms']) / 9, 1),
-            'peak_platform': max(platform_management['platforms'], key=lambda p: p['trains_recent'])['platform_number'],
-            'recommendations': [
-                "Platform 3 showing high utilization - consider load balancing",
-                "Maintenance window available on Platform 7 between 14:00-16:00",
-                "Express clearing recommended for Platform 1 during evening peak"
-            ]
-        }
-        
-        return jsonify(platform_management)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/real-time-events', methods=['GET'])
-def get_real_time_events():
-    """Get real-time events and system activities"""
-    try:
-        # This would normally come from the live_events table
-        # For now, we'll generate some realistic events
-        current_time = datetime.datetime.now()
-        
-        events = [
-            {
-                'timestamp': (current_time - datetime.timedelta(minutes=5)).isoformat(),
-                'type': 'TRAIN_ARRIVAL',
-                'train_number': '12429',
-                'platform': 3,
-                'description': 'Lucknow Mail arrived at Platform 3',
-                'severity': 'INFO'
-            },
-            {
-                'timestamp': (current_time - datetime.timedelta(minutes=12)).isoformat(),
-                'type': 'DELAY_UPDATE',
-                'train_number': '22417',
-                'platform': 5,
-                'description': 'Mahamana Express delayed by 15 minutes',
-                'severity': 'MEDIUM'
-            },
-            {
-                'timestamp': (current_time - datetime.timedelta(minutes=18)).isoformat(),
-                'type': 'OPTIMIZATION',
-                'description': 'Schedule optimization completed - 3 conflicts resolved',
-                'severity': 'INFO'
-            },
-            {
-                'timestamp': (current_time - datetime.timedelta(minutes=25)).isoformat(),
-                'type': 'PLATFORM_CHANGE',
-                'train_number': '15273',
-                'platform': 7,
-                'description': 'Satyagrah Express reassigned to Platform 7',
-                'severity': 'MEDIUM'
-            }
-        ]
-        
-        return jsonify({
-            'timestamp': current_time.isoformat(),
-            'events': events,
-            'event_summary': {
-                'total_events_last_hour': len(events),
-                'critical_events': 0,
-                'medium_events': 2,
-                'info_events': 2
-            }
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/system-health', methods=['GET'])
-def get_system_health():
-    """Get comprehensive system health metrics"""
-    try:
-        performance_metrics = charbagh_db.get_performance_metrics()
-        
-        system_health = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'overall_health': 'EXCELLENT',
-            'health_score': 92.5,
-            'components': {
-                'database': {
-                    'status': 'OPERATIONAL',
-                    'response_time_ms': 12.3,
-                    'uptime': '99.97%',
-                    'health_score': 98.5
-                },
-                'optimization_engine': {
-                    'status': 'OPERATIONAL',
-                    'last_run': (datetime.datetime.now() - datetime.timedelta(minutes=8)).isoformat(),
-                    'success_rate': '94.2%',
-                    'health_score': 94.2
-                },
-                'ml_predictor': {
-                    'status': 'OPERATIONAL',
-                    'accuracy': '85.0%',
-                    'predictions_today': 156,
-                    'health_score': 87.5
-                },
-                'live_updates': {
-                    'status': 'ACTIVE',
-                    'update_frequency': '30 seconds',
-                    'last_update': datetime.datetime.now().isoformat(),
-                    'health_score': 95.8
-                }
-            },
-            'performance_indicators': {
-                'system_efficiency': performance_metrics.get('system_efficiency', 0),
-                'response_time': 'Excellent (<50ms)',
-                'throughput': 'High (22.5 trains/hour)',
-                'reliability': '99.5%'
-            },
-            'alerts': [],
-            'recommendations': [
-                "System performing optimally - no immediate action required",
-                "Consider ML model retraining next week for improved accuracy",
-                "Database maintenance scheduled for upcoming weekend"
-            ]
-        }
-        
-        return jsonify(system_health)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-# Legacy endpoints (redirected to new enhanced versions)
-@app.route('/api/network-status', methods=['GET'])
-def legacy_network_status():
-    """Legacy endpoint redirected to enhanced version"""
-    return get_live_network_status()
-
-@app.route('/api/ai-optimize', methods=['POST'])
-def legacy_ai_optimize():
-    """Legacy endpoint redirected to dynamic optimization"""
-    return run_dynamic_optimization()
-
-@app.route('/api/optimize', methods=['POST'])
-def legacy_optimize():
-    """Legacy endpoint redirected to dynamic optimization"""
-    return run_dynamic_optimization()
-
-if __name__ == '__main__':
-    print("🚀 Starting Enhanced Live Railway Traffic Control System")
-    print("=" * 60)
-    print("✅ Live Database: Charbagh Railway Station with 2500+ train records")
-    print("✅ Dynamic Optimization: AI-enhanced with varying results")
-    print("✅ What-If Scenarios: ML-powered impact prediction")
-    print("✅ Conflict Detection: Advanced ML-based conflict resolution")
-    print("✅ Comprehensive Analytics: 25+ KPIs with real-time updates")
-    print("✅ Schedule Reoptimization: Dynamic real-time adjustments")
-    print("✅ Interactive Features: All critical options clickable")
-    print("=" * 60)
-    print("🌐 Server starting on http://localhost:5000")
-    print("📊 Live updates active - data refreshes every 30 seconds")
-    print("🧠 AI/ML features fully operational")
-    print("=" * 60)
-    
-    app.run(debug=True, port=5000, threaded=True)
\ No newline at end of file
+# app_enhanced_live.py - Enhanced Flask Application with Live Database Integration
+from flask import Flask, request, render_template, stream_with_context
+from flask_cors import CORS
+import orjson
+import numpy as np
+import datetime
+import json
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from live_database import charbagh_db
+from live_cache import ttl_cache
+from dynamic_optimizer import dynamic_optimizer
+from ml_predictor import TrainDelayPredictor
+from time_series_analyzer import RailwayTimeSeriesAnalyzer
+
+app = Flask(__name__)
+CORS(app)
+
+def ojson(obj):
+    """Serialize API payloads with orjson instead of flask.jsonify.
+
+    orjson encodes directly to bytes and handles datetime and numpy values
+    natively, which is several times faster than the stdlib json path on
+    the large nested analytics payloads these endpoints return.
+    """
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+
+def ojson_stream(sections):
+    """Stream a JSON object one top-level section at a time.
+
+    Each (key, value) pair is orjson-encoded and flushed as its own chunk,
+    improving time-to-first-byte and avoiding holding the whole serialized
+    payload in memory alongside the source dict.
+    """
+    def gen():
+        yield b'{'
+        first = True
+        for key, value in sections:
+            prefix = b'' if first else b','
+            first = False
+            yield prefix + orjson.dumps(key) + b':' + orjson.dumps(
+                value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        yield b'}'
+    return app.response_class(stream_with_context(gen()), mimetype='application/json')
+
+# Global instances
+ml_predictor = TrainDelayPredictor()
+time_series_analyzer = RailwayTimeSeriesAnalyzer()
+
+# Short-TTL cached views of the live database - the dashboard polls several
+# endpoints at once and each endpoint needs the same underlying queries
+@ttl_cache(seconds=5)
+def get_cached_train_data():
+    return charbagh_db.get_live_train_data()
+
+@ttl_cache(seconds=5)
+def get_cached_platform_status():
+    return charbagh_db.get_platform_status()
+
+@ttl_cache(seconds=5)
+def get_cached_performance_metrics():
+    return charbagh_db.get_performance_metrics()
+
+@ttl_cache(seconds=5)
+def get_cached_conflicts():
+    return charbagh_db.detect_conflicts()
+
+@ttl_cache(seconds=5)
+def get_cached_analytics_data():
+    return charbagh_db.get_analytics_data()
+
+@ttl_cache(seconds=5)
+def get_cached_delay_stats():
+    recent_date = datetime.date.today() - datetime.timedelta(days=1)
+    return charbagh_db.get_delay_stats(recent_date.isoformat())
+
+@lru_cache(maxsize=8192)
+def _arrival_date(date_prefix):
+    """Memoized str->date parse for the 10-char scheduled_arrival prefix.
+
+    Only ~a dozen distinct dates are live at any time, so this turns the
+    per-train date parse into a dict hit.
+    """
+    return datetime.date.fromisoformat(date_prefix)
+
+def etag_guard():
+    """Return (etag, response-or-None) for conditional GET handling.
+
+    The ETag tracks the live-update generation counter, so idle dashboard
+    polls get an empty 304 instead of re-downloading identical JSON.
+    """
+    etag = f'W/"{charbagh_db.generation}"'
+    if request.headers.get('If-None-Match') == etag:
+        return etag, app.response_class(status=304)
+    return etag, None
+
+def with_etag(response, etag):
+    response.headers['ETag'] = etag
+    return response
+
+def bucket_trains(trains, today=None):
+    """Index trains by status and recency in a single pass.
+
+    Returns (status_buckets, recent_trains) where recent_trains covers the
+    last 2 days. Replaces the repeated list comprehensions that each
+    re-scanned the full train list per KPI. Callers that already captured
+    the current time pass its date in as today.
+    """
+    if today is None:
+        today = datetime.date.today()
+    recent_date = today - datetime.timedelta(days=1)
+    buckets = {'Scheduled': [], 'Delayed': [], 'At Platform': [], 'Departed': []}
+    recent = []
+    for t in trains:
+        buckets.setdefault(t['current_status'], []).append(t)
+        # Parse only the 10-char date prefix instead of a full datetime
+        if _arrival_date(t['scheduled_arrival'][:10]) >= recent_date:
+            recent.append(t)
+    return buckets, recent
+
+# Constant response fragments - computed once instead of per request
+_PLATFORM_EFFICIENCY = {f"Platform_{i}": round(85 + (i * 2.3), 1) for i in range(1, 10)}
+_CRITICAL_TIME_WINDOWS = ['08:00-09:30', '17:30-19:00', '21:00-22:30']
+
+# Risk thresholds mirror ml_predictor.get_risk_assessment (<5 LOW, <15 MEDIUM)
+# as a searchsorted table so the whole prediction batch classifies at once
+_RISK_THRESHOLDS = np.array([5.0, 15.0])
+_RISK_LABELS = ('LOW', 'MEDIUM', 'HIGH')
+_PLATFORM_RECOMMENDATIONS = [
+    "Platform 3 showing high utilization - consider load balancing",
+    "Maintenance window available on Platform 7 between 14:00-16:00",
+    "Express clearing recommended for Platform 1 during evening peak"
+]
+
+# Start live database updates
+charbagh_db.start_live_updates()
+
+@app.route('/')
+def index():
+    """Main dashboard"""
+    return render_template('dashboard_pro.html')
+
+@app.route('/ai-engine')
+def ai_engine_page():
+    """AI Engine page with enhanced features"""
+    return render_template('ai_engine.html')
+
+@app.route('/analytics')
+def analytics_page():
+    """Enhanced analytics page with comprehensive KPIs"""
+    return render_template('analytics.html')
+
+@app.route('/section-control')
+def section_control_page():
+    """Section control page with live platform data"""
+    return render_template('section_control.html')
+
+@app.route('/train-records')
+def train_records_page():
+    """Train records with live database"""
+    return render_template('train_records.html')
+
+# ==================== ENHANCED API ENDPOINTS ====================
+
+@app.route('/api/live-network-status', methods=['GET'])
+def get_live_network_status():
+    """Get comprehensive live network status with all metrics"""
+    try:
+        etag, not_modified = etag_guard()
+        if not_modified:
+            return not_modified
+
+        # Get live data from database
+        trains = get_cached_train_data()
+        platform_status = get_cached_platform_status()
+        performance_metrics = get_cached_performance_metrics()
+        conflicts = get_cached_conflicts()
+        analytics_data = get_cached_analytics_data()
+        
+        # Capture the clock once for the whole request
+        now = datetime.datetime.now()
+
+        # Current trains by status - one pass over the train list
+        status_buckets, recent_trains = bucket_trains(trains, today=now.date())
+        current_trains = {
+            'scheduled': status_buckets['Scheduled'],
+            'delayed': status_buckets['Delayed'],
+            'at_platform': status_buckets['At Platform'],
+            'departed': status_buckets['Departed']
+        }
+
+        # Enhanced KPIs - use recent trains (last 2 days) for better data coverage
+        total_trains_today = len(recent_trains)
+        
+        enhanced_status = {
+            'timestamp': now.isoformat(),
+            'system_status': 'OPERATIONAL',
+            'live_database_active': True,
+            'total_trains_in_system': len(trains),
+            'trains_recent': total_trains_today,
+            'platforms_operational': len([p for p in platform_status if p['maintenance_status'] == 'Operational']),
+            
+            # Live train status
+            'current_trains': current_trains,
+            'platform_status': platform_status,
+            
+            # Performance metrics
+            'performance': performance_metrics,
+            
+            # Conflicts and issues
+            'conflicts': conflicts,
+            'critical_alerts': len([c for c in conflicts if c['severity'] == 'High']),
+            
+            # Analytics data
+            'analytics': analytics_data,
+            
+            # Enhanced KPIs
+            'kpis': {
+                'punctuality_rate': round((performance_metrics.get('on_time_trains', 0) / max(performance_metrics.get('total_trains', 1), 1)) * 100, 1),
+                'platform_utilization': round(performance_metrics.get('platform_utilization', 0), 1),
+                'avg_delay_minutes': round(performance_metrics.get('avg_delay_minutes', 0), 1),
+                'passenger_satisfaction': round(performance_metrics.get('passenger_satisfaction', 0), 1),
+                'system_efficiency': round(performance_metrics.get('system_efficiency', 0), 1),
+                'conflicts_active': len(conflicts),
+                'trains_per_hour': round(total_trains_today / 48, 2),  # Divided by 48 hours for 2-day span
+                'delay_trend': 'improving' if performance_metrics.get('avg_delay_minutes', 0) < 15 else 'concerning'
+            }
+        }
+        
+        return with_etag(ojson(enhanced_status), etag)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/dynamic-optimize', methods=['POST'])
+def run_dynamic_optimization():
+    """Run dynamic optimization with varying results"""
+    try:
+        result = dynamic_optimizer.run_optimization()
+        charbagh_db.notify_change()
+        return ojson(result)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/what-if-scenario', methods=['POST'])
+def run_what_if_scenario():
+    """Run what-if scenario with dynamic results"""
+    try:
+        data = request.json or {}
+        result = dynamic_optimizer.run_what_if_scenario(data)
+        return ojson(result)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/schedule-reoptimize', methods=['POST'])
+def schedule_reoptimization():
+    """Dynamic schedule reoptimization"""
+    try:
+        # Get reoptimization parameters
+        data = request.json or {}
+        reoptimize_type = data.get('type', 'full')  # full, partial, emergency
+        priority_trains = data.get('priority_trains', [])
+        
+        # Run reoptimization
+        result = dynamic_optimizer.run_optimization()
+        charbagh_db.notify_change()
+        
+        # Add reoptimization-specific data
+        now = datetime.datetime.now()
+        reoptimization_result = {
+            'reoptimization_id': f"REOPT_{now.strftime('%Y%m%d_%H%M%S')}",
+            'type': reoptimize_type,
+            'triggered_at': now.isoformat(),
+            'reason': data.get('reason', 'Manual reoptimization requested'),
+            'priority_trains_considered': priority_trains,
+            'optimization_result': result,
+            'changes_applied': {
+                'platform_reassignments': len(result.get('detailed_results', {}).get('platform_assignments', {})),
+                'schedule_adjustments': len(result.get('detailed_results', {}).get('schedule_adjustments', {})),
+                'conflicts_resolved': result.get('conflicts_resolved', 0)
+            },
+            'next_reoptimization_recommended': (now + datetime.timedelta(minutes=30)).isoformat()
+        }
+        
+        return ojson(reoptimization_result)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/conflict-detection', methods=['GET'])
+def get_conflict_detection():
+    """Get comprehensive conflict detection with ML predictions"""
+    try:
+        etag, not_modified = etag_guard()
+        if not_modified:
+            return not_modified
+
+        conflicts = get_cached_conflicts()
+        trains = get_cached_train_data()
+        
+        # Enhanced conflict analysis
+        conflict_analysis = {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'total_conflicts': len(conflicts),
+            'conflicts_by_severity': {
+                'high': len([c for c in conflicts if c['severity'] == 'High']),
+                'medium': len([c for c in conflicts if c['severity'] == 'Medium']),
+                'low': len([c for c in conflicts if c['severity'] == 'Low'])
+            },
+            'conflicts_by_type': {
+                'platform': len([c for c in conflicts if c['type'] == 'Platform Conflict']),
+                'schedule': len([c for c in conflicts if c['type'] == 'Schedule Conflict']),
+                'resource': len([c for c in conflicts if c['type'] == 'Resource Conflict'])
+            },
+            'detailed_conflicts': conflicts,
+            'predictive_analysis': {
+                'probability_new_conflicts_next_hour': min(len(conflicts) * 15, 85),
+                'critical_time_windows': _CRITICAL_TIME_WINDOWS,
+                'high_risk_platforms': [c['platform'] for c in conflicts if c['severity'] == 'High']
+            },
+            'resolution_suggestions': [
+                f"Immediate attention required for {len([c for c in conflicts if c['severity'] == 'High'])} high-severity conflicts",
+                "Consider implementing dynamic platform allocation for peak hours",
+                f"Monitor platforms {list(set([c['platform'] for c in conflicts]))} for continued conflicts"
+            ]
+        }
+        
+        return with_etag(ojson(conflict_analysis), etag)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/comprehensive-analytics', methods=['GET'])
+def get_comprehensive_analytics():
+    """Get comprehensive analytics with multiple KPIs"""
+    try:
+        etag, not_modified = etag_guard()
+        if not_modified:
+            return not_modified
+
+        # Get data from various sources
+        trains = get_cached_train_data()
+        performance_metrics = get_cached_performance_metrics()
+        analytics_data = get_cached_analytics_data()
+        platform_status = get_cached_platform_status()
+        
+        # Calculate comprehensive KPIs - use recent trains for better data coverage
+        now = datetime.datetime.now()
+        _, today_trains = bucket_trains(trains, today=now.date())
+
+        # Delay distribution and financial KPIs come from one indexed SQL
+        # aggregation instead of Python/NumPy passes over the train list
+        delay_stats = get_cached_delay_stats()
+        
+        def analytics_sections():
+            # Yield one top-level section at a time so the payload is
+            # streamed instead of double-buffered as a single dict + bytes
+            yield 'timestamp', now.isoformat()
+            yield 'summary_kpis', {
+                'total_trains_managed': len(trains),
+                'trains_recent': len(today_trains),
+                'punctuality_rate': round((performance_metrics.get('on_time_trains', 0) / max(performance_metrics.get('total_trains', 1), 1)) * 100, 1),
+                'average_delay': round(performance_metrics.get('avg_delay_minutes', 0), 1),
+                'platform_utilization': round(performance_metrics.get('platform_utilization', 0), 1),
+                'system_efficiency': round(performance_metrics.get('system_efficiency', 0), 1),
+                'passenger_satisfaction': round(performance_metrics.get('passenger_satisfaction', 0), 1)
+            }
+            yield 'operational_kpis', {
+                'trains_per_hour': round(len(today_trains) / 48, 2),  # 48 hours for 2-day span
+                'peak_hour_capacity': max((item['trains'] for item in analytics_data.get('hourly_traffic') or ()), default=0),
+                'platform_efficiency': _PLATFORM_EFFICIENCY,
+                'delay_distribution': {
+                    'on_time': delay_stats['on_time'],
+                    'minor_delay_5_15min': delay_stats['minor'],
+                    'moderate_delay_15_30min': delay_stats['moderate'],
+                    'major_delay_30min_plus': delay_stats['major']
+                },
+                'train_type_performance': analytics_data.get('train_type_analytics', [])
+            }
+            yield 'financial_kpis', {
+                'estimated_delay_cost_inr': delay_stats['total_delay_minutes'] * 800,
+                'operational_efficiency_savings': 45000,  # Estimated daily savings
+                'passenger_compensation_liability': delay_stats['compensation_minutes'] * 50,
+                'resource_utilization_value': 127500
+            }
+            yield 'quality_kpis', {
+                'service_reliability': round(95.2 - (performance_metrics.get('avg_delay_minutes', 0) * 0.8), 1),
+                'customer_experience_score': round(performance_metrics.get('passenger_satisfaction', 0), 1),
+                'safety_compliance': 99.8,
+                'environmental_efficiency': 87.3,
+                'staff_productivity': 91.5
+            }
+            yield 'predictive_kpis', {
+                'next_hour_delay_probability': min(performance_metrics.get('avg_delay_minutes', 0) * 3.5, 75),
+                'congestion_forecast': 'moderate' if len(today_trains) < 150 else 'high',
+                'maintenance_window_availability': '14:30-16:00',
+                'optimal_scheduling_score': round(82.5 + (performance_metrics.get('system_efficiency', 0) * 0.15), 1)
+            }
+            yield 'detailed_analytics', analytics_data
+            yield 'platform_status', platform_status
+            yield 'trend_analysis', {
+                'punctuality_trend': 'improving',
+                'delay_trend': 'stable',
+                'efficiency_trend': 'improving',
+                'passenger_satisfaction_trend': 'stable'
+            }
+
+        return with_etag(ojson_stream(analytics_sections()), etag)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/ml-predictions', methods=['GET'])
+def get_ml_predictions():
+    """Get ML predictions for current trains"""
+    try:
+        etag, not_modified = etag_guard()
+        if not_modified:
+            return not_modified
+
+        trains = get_cached_train_data()
+        current_trains = [t for t in trains if t['current_status'] in ['Scheduled', 'Delayed', 'At Platform']]
+        
+        predictions = {}
+        current_time = datetime.datetime.now()
+        batch = current_trains[:15]  # Limit to 15 trains for performance
+
+        # One (n, 6) feature matrix through the model instead of a
+        # per-train scalar predict call
+        features = np.array([
+            [current_time.hour, current_time.weekday(), 0.8, 0.6,
+             train['priority'], train['max_speed']]
+            for train in batch
+        ], dtype=np.float64).reshape(-1, 6)
+        predicted_delays = ml_predictor.predict_batch(features) if batch else []
+        # Classify the whole batch in one searchsorted call instead of a
+        # per-train get_risk_assessment method dispatch
+        risk_levels = [_RISK_LABELS[i] for i in np.searchsorted(_RISK_THRESHOLDS, predicted_delays)]
+
+        for train, predicted_delay, risk_level in zip(batch, predicted_delays, risk_levels):
+            predictions[train['train_number']] = {
+                'train_name': train['train_name'],
+                'predicted_delay_minutes': round(float(predicted_delay), 1),
+                'current_delay': train['delay_minutes'],
+                'risk_level': risk_level,
+                'confidence': 0.85,
+                'platform': train['platform_number'],
+                'recommendation': f"Monitor closely - {risk_level} risk" if risk_level != "LOW" else "Normal monitoring"
+            }
+        
+        return with_etag(ojson({
+            'timestamp': current_time.isoformat(),
+            'predictions': predictions,
+            'summary': {
+                'total_predictions': len(predictions),
+                'high_risk_trains': len([p for p in predictions.values() if p['risk_level'] == 'HIGH']),
+                'medium_risk_trains': len([p for p in predictions.values() if p['risk_level'] == 'MEDIUM']),
+                'low_risk_trains': len([p for p in predictions.values() if p['risk_level'] == 'LOW'])
+            },
+            'model_info': {
+                'type': 'Linear Regression',
+                'accuracy': '85%',
+                'last_updated': current_time.isoformat()
+            }
+        }), etag)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/platform-management', methods=['GET'])
+def get_platform_management():
+    """Get comprehensive platform management data"""
+    try:
+        etag, not_modified = etag_guard()
+        if not_modified:
+            return not_modified
+
+        platform_status = get_cached_platform_status()
+        trains = get_cached_train_data()
+        
+        # Enhanced platform information
+        now = datetime.datetime.now()
+        recent_date = now.date() - datetime.timedelta(days=1)
+        next_slot = (now + datetime.timedelta(hours=2, minutes=15)).isoformat()
+        platform_management = {
+            'timestamp': now.isoformat(),
+            'total_platforms': 9,
+            'platforms': []
+        }
+        
+        # Group recent trains by platform in one pass instead of scanning
+        # the full train list once per platform
+        recent_by_platform = defaultdict(list)
+        for t in trains:
+            if _arrival_date(t['scheduled_arrival'][:10]) >= recent_date:
+                recent_by_platform[t['platform_number']].append(t)
+
+        peak_platform = None  # Tracked during the loop instead of a max() re-scan
+        for platform in platform_status:
+            today_trains = recent_by_platform[platform['platform_number']]
+            
+            platform_info = {
+                'platform_number': platform['platform_number'],
+                'current_status': platform['status'],
+                'maintenance_status': platform['maintenance_status'],
+                'current_train': platform['current_train'],
+                'current_train_name': platform.get('train_name'),
+                'next_departure': platform.get('scheduled_departure'),
+                'trains_recent': len(today_trains),
+                'utilization_percentage': min(len(today_trains) * 2.1, 100),  # Adjusted for 2-day span
+                'avg_delay_recent': round(sum(t['delay_minutes'] for t in today_trains) / max(len(today_trains), 1), 1),
+                'capacity_status': 'optimal' if len(today_trains) < 40 else 'high',  # Adjusted for 2-day span
+                'next_available_slot': next_slot
+            }
+            platform_management['platforms'].append(platform_info)
+            if peak_platform is None or platform_info['trains_recent'] > peak_platform['trains_recent']:
+                peak_platform = platform_info
+        
+        # Summary statistics
+        platform_management['summary'] = {
+            'occupied_platforms': len([p for p in platform_status if p['status'] == 'Occupied']),
+            'available_platforms': len([p for p in platform_status if p['status'] == 'Available']),
+            'maintenance_platforms': len([p for p in platform_status if p['maintenance_status'] != 'Operational']),
+            'avg_utilization': round(sum(p['utilization_percentage'] for p in platform_management['platforms']) / 9, 1),
+            'peak_platform': peak_platform['platform_number'] if peak_platform else None,
+            'recommendations': _PLATFORM_RECOMMENDATIONS
+        }
+        
+        return with_etag(ojson(platform_management), etag)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/real-time-events', methods=['GET'])
+def get_real_time_events():
+    """Get real-time events and system activities"""
+    try:
+        # This would normally come from the live_events table
+        # For now, we'll generate some realistic events
+        current_time = datetime.datetime.now()
+        
+        events = [
+            {
+                'timestamp': (current_time - datetime.timedelta(minutes=5)).isoformat(),
+                'type': 'TRAIN_ARRIVAL',
+                'train_number': '12429',
+                'platform': 3,
+                'description': 'Lucknow Mail arrived at Platform 3',
+                'severity': 'INFO'
+            },
+            {
+                'timestamp': (current_time - datetime.timedelta(minutes=12)).isoformat(),
+                'type': 'DELAY_UPDATE',
+                'train_number': '22417',
+                'platform': 5,
+                'description': 'Mahamana Express delayed by 15 minutes',
+                'severity': 'MEDIUM'
+            },
+            {
+                'timestamp': (current_time - datetime.timedelta(minutes=18)).isoformat(),
+                'type': 'OPTIMIZATION',
+                'description': 'Schedule optimization completed - 3 conflicts resolved',
+                'severity': 'INFO'
+            },
+            {
+                'timestamp': (current_time - datetime.timedelta(minutes=25)).isoformat(),
+                'type': 'PLATFORM_CHANGE',
+                'train_number': '15273',
+                'platform': 7,
+                'description': 'Satyagrah Express reassigned to Platform 7',
+                'severity': 'MEDIUM'
+            }
+        ]
+        
+        return ojson({
+            'timestamp': current_time.isoformat(),
+            'events': events,
+            'event_summary': {
+                'total_events_last_hour': len(events),
+                'critical_events': 0,
+                'medium_events': 2,
+                'info_events': 2
+            }
+        })
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+@app.route('/api/system-health', methods=['GET'])
+def get_system_health():
+    """Get comprehensive system health metrics"""
+    try:
+        performance_metrics = get_cached_performance_metrics()
+        
+        now = datetime.datetime.now()
+        system_health = {
+            'timestamp': now.isoformat(),
+            'overall_health': 'EXCELLENT',
+            'health_score': 92.5,
+            'components': {
+                'database': {
+                    'status': 'OPERATIONAL',
+                    'response_time_ms': 12.3,
+                    'uptime': '99.97%',
+                    'health_score': 98.5
+                },
+                'optimization_engine': {
+                    'status': 'OPERATIONAL',
+                    'last_run': (now - datetime.timedelta(minutes=8)).isoformat(),
+                    'success_rate': '94.2%',
+                    'health_score': 94.2
+                },
+                'ml_predictor': {
+                    'status': 'OPERATIONAL',
+                    'accuracy': '85.0%',
+                    'predictions_today': 156,
+                    'health_score': 87.5
+                },
+                'live_updates': {
+                    'status': 'ACTIVE',
+                    'update_frequency': '30 seconds',
+                    'last_update': now.isoformat(),
+                    'health_score': 95.8
+                }
+            },
+            'performance_indicators': {
+                'system_efficiency': performance_metrics.get('system_efficiency', 0),
+                'response_time': 'Excellent (<50ms)',
+                'throughput': 'High (22.5 trains/hour)',
+                'reliability': '99.5%'
+            },
+            'alerts': [],
+            'recommendations': [
+                "System performing optimally - no immediate action required",
+                "Consider ML model retraining next week for improved accuracy",
+                "Database maintenance scheduled for upcoming weekend"
+            ]
+        }
+        
+        return ojson(system_health)
+    except Exception as e:
+        return ojson({'error': str(e)}), 500
+
+# Legacy endpoints (redirected to new enhanced versions)
+@app.route('/api/network-status', methods=['GET'])
+def legacy_network_status():
+    """Legacy endpoint redirected to enhanced version"""
+    return get_live_network_status()
+
+@app.route('/api/ai-optimize', methods=['POST'])
+def legacy_ai_optimize():
+    """Legacy endpoint redirected to dynamic optimization"""
+    return run_dynamic_optimization()
+
+@app.route('/api/optimize', methods=['POST'])
+def legacy_optimize():
+    """Legacy endpoint redirected to dynamic optimization"""
+    return run_dynamic_optimization()
+
+if __name__ == '__main__':
+    print("🚀 Starting Enhanced Live Railway Traffic Control System")
+    print("=" * 60)
+    print("✅ Live Database: Charbagh Railway Station with 2500+ train records")
+    print("✅ Dynamic Optimization: AI-enhanced with varying results")
+    print("✅ What-If Scenarios: ML-powered impact prediction")
+    print("✅ Conflict Detection: Advanced ML-based conflict resolution")
+    print("✅ Comprehensive Analytics: 25+ KPIs with real-time updates")
+    print("✅ Schedule Reoptimization: Dynamic real-time adjustments")
+    print("✅ Interactive Features: All critical options clickable")
+    print("=" * 60)
+    print("🌐 Server starting on http://localhost:5000")
+    print("💡 For production use: gunicorn -c gunicorn.conf.py wsgi:app")
+    print("📊 Live updates active - data refreshes every 30 seconds")
+    print("🧠 AI/ML features fully operational")
+    print("=" * 60)
+    
+    app.run(port=5000, threaded=True)
\ No newline at end of file
@@ -1,181 +1,272 @@
-# create_db.py
-# Final, corrected version. Ready to run.
-import sqlite3
-import random
-import datetime
-
-DB_FILE = "railway_data.db"
-
-def generate_realistic_data():
-    """Generates realistic historical data for model training."""
-    print("Generating 2000 historical run records for training...")
-    runs = []
-    base_time = datetime.datetime.now()
-
-    for i in range(2000):
-        # Simulate different times of day and week
-        run_time = base_time - datetime.timedelta(hours=random.randint(0, 720))
-        hour_of_day = run_time.hour
-        day_of_week = run_time.weekday()  # Monday=0, Sunday=6
-
-        # Simulate conditions
-        weather_score = round(random.uniform(0.4, 1.0), 2)  # 1.0 is perfect weather
-        train_priority = random.randint(1, 5)
-        base_speed = random.choice([80, 100, 110, 130])
-
-        # Make congestion and delays higher during peak hours (7-10am, 5-8pm)
-        is_peak_hour = (7 <= hour_of_day <= 10) or (17 <= hour_of_day <= 20)
-
-        if is_peak_hour:
-            section_congestion = round(random.uniform(0.6, 1.0), 2)
-            base_delay = random.uniform(5, 15)
-        else:
-            section_congestion = round(random.uniform(0.1, 0.5), 2)
-            base_delay = random.uniform(0, 5)
-
-        # The "ground truth" formula our ML model will try to learn
-        actual_delay = (
-            base_delay
-            + (1 - section_congestion) * -2  # Lower congestion reduces delay
-            + (1 - weather_score) * 10       # Bad weather increases delay
-            + (5 - train_priority) * 2       # Higher priority (lower number) reduces delay
-            + random.uniform(-2, 2)          # Random noise
-        )
-        actual_delay = max(0, round(actual_delay, 1))  # Delay can't be negative
-
-        runs.append((
-            run_time.isoformat(),
-            'T' + str(random.randint(1, 8)),  # Random train_id
-            hour_of_day,
-            day_of_week,
-            weather_score,
-            section_congestion,
-            train_priority,
-            base_speed,
-            actual_delay
-        ))
-    return runs
-
-
-def create_database():
-    """Creates and populates the SQLite database."""
-    try:
-        con = sqlite3.connect(DB_FILE)
-        cur = con.cursor()
-        print(f"Database '{DB_FILE}' created/connected.")
-
-        # --- Create Schema ---
-        print("Creating tables...")
-
-        # Stations Table (5 columns)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS stations (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                position_km REAL NOT NULL,
-                platform_count INTEGER DEFAULT 1,
-                has_loop_line INTEGER DEFAULT 0
-            )
-        """)
-
-        # Sections Table (6 columns)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS sections (
-                id TEXT PRIMARY KEY,
-                from_station_id TEXT NOT NULL,
-                to_station_id TEXT NOT NULL,
-                length_km REAL NOT NULL,
-                track_type TEXT,
-                capacity INTEGER DEFAULT 1,
-                FOREIGN KEY (from_station_id) REFERENCES stations (id),
-                FOREIGN KEY (to_station_id) REFERENCES stations (id)
-                    
-            )
-        """)
-
-        # Master list of Train types (6 columns)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS trains_master (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                train_type TEXT,
-                priority INTEGER,
-                max_speed_kmph INTEGER,
-                last_known_delay_minutes REAL DEFAULT 0
-            )
-        """)
-
-        # Historical Data for ML Training (9 columns, excluding auto-incrementing ID)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS historical_runs (
-                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                train_id TEXT,
-                hour_of_day INTEGER,
-                day_of_week INTEGER,
-                weather_score REAL,
-                section_congestion REAL,
-                train_priority INTEGER,
-                base_speed INTEGER,
-                actual_delay_minutes REAL
-            )
-        """)
-
-        # --- Populate Static Data ---
-        print("Populating static network data...")
-        
-        # Data for stations table (5 values per tuple)
-        stations_data = [
-            ('CST', 'CST', 0.0, 18, 1), ('BYC', 'Byculla', 4.5, 4, 0),
-            ('DDR', 'Dadar', 9.0, 15, 1), ('KRL', 'Kurla', 16.0, 8, 1),
-            ('GTN', 'Ghatkopar', 20.0, 4, 0), ('TNA', 'Thane', 33.0, 10, 1)
-        ]
-        
-        # Data for sections table (6 values per tuple)
-        sections_data = [
-            ('SEC01', 'CST', 'BYC', 4.5, 'DOUBLE', 2),
-            ('SEC02', 'BYC', 'DDR', 4.5, 'DOUBLE', 2),
-            ('SEC03', 'DDR', 'KRL', 7.0, 'QUADRUPLE', 4),
-            ('SEC04', 'KRL', 'GTN', 4.0, 'DOUBLE', 2),
-            ('SEC05', 'GTN', 'TNA', 13.0, 'QUADRUPLE', 4)
-        ]
-        
-        # Data for trains_master table (6 values per tuple)
-        trains_data = [
-            ('T1', 'Mumbai Express', 'EXPRESS', 1, 130, 0), ('T2', 'Pune Mail', 'EXPRESS', 1, 130, 0),
-            ('T3', 'Dadar Slow', 'LOCAL', 3, 100, 0), ('T4', 'Thane Fast', 'LOCAL', 2, 110, 0),
-            ('T5', 'Goods Carrier', 'FREIGHT', 5, 80, 0), ('T6', 'Maintenance Special', 'SPECIAL', 4, 80, 0),
-            ('T7', 'Kurla Slow', 'LOCAL', 3, 100, 0), ('T8', 'CST Fast', 'LOCAL', 2, 110, 0)
-        ]
-
-        # --- Execute INSERT statements ---
-        cur.executemany("INSERT OR IGNORE INTO stations VALUES (?, ?, ?, ?, ?)", stations_data)
-        cur.executemany("INSERT OR IGNORE INTO sections VALUES (?, ?, ?, ?, ?, ?)", sections_data)
-        cur.executemany("INSERT OR IGNORE INTO trains_master VALUES (?, ?, ?, ?, ?, ?)", trains_data)
-
-        # --- Populate Historical Data ---
-        historical_data = generate_realistic_data()
-        cur.execute("DELETE FROM historical_runs")  # Clear old data before inserting new
-        cur.executemany("""
-            INSERT INTO historical_runs (
-                timestamp, train_id, hour_of_day, day_of_week, weather_score, 
-                section_congestion, train_priority, base_speed, actual_delay_minutes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, historical_data)
-
-        con.commit()
-        print(f"Successfully populated database with {cur.rowcount} historical records.")
-
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        # Add traceback for detailed debugging if needed
-        import traceback
-        traceback.print_exc()
-    finally:
-        if con:
-            con.close()
-            print("Database connection closed.")
-
-
-if __name__ == "__main__":
+# create_db.py
+# Final, corrected version. Ready to run.
+import os
+import sqlite3
+import datetime
+import itertools
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    njit = None
+
+DB_FILE = "railway_data.db"
+
+TRAIN_IDS = ('T1', 'T2', 'T3', 'T4', 'T5', 'T6', 'T7', 'T8')
+
+
+def compute_delays(base_delay, congestion, weather, priority, noise):
+    """Element-wise ground-truth delay formula the ML model will learn."""
+    delay = (
+        base_delay
+        + (1 - congestion) * -2   # Lower congestion reduces delay
+        + (1 - weather) * 10      # Bad weather increases delay
+        + (5 - priority) * 2      # Higher priority (lower number) reduces delay
+        + noise                   # Random noise
+    )
+    return np.maximum(0, delay)
+
+
+if njit is not None:
+    # LLVM-compiled loop pays off once the simulation is scaled well past
+    # 2000 rows; cache=True keeps the compiled kernel across runs
+    compute_delays = njit(cache=True, fastmath=True)(compute_delays)
+
+def generate_realistic_data():
+    """Yields realistic historical data for model training."""
+    print("Generating 2000 historical run records for training...")
+    n = 2000
+    base_time = datetime.datetime.now()
+
+    # Draw every column as one batched RNG call instead of ~18000
+    # per-row random.* invocations in interpreted Python
+    rng = np.random.default_rng()
+
+    # Simulate different times of day and week. Building the timestamps as
+    # a datetime64 array and formatting them with np.datetime_as_string is
+    # one C loop instead of 2000 datetime allocations + .isoformat() calls
+    base = np.datetime64(base_time.replace(microsecond=0))
+    run_times = base - rng.integers(0, 721, n).astype('timedelta64[h]')
+    timestamps = np.datetime_as_string(run_times, unit='s')
+    hour_of_day = run_times.astype('datetime64[h]').astype(np.int64) % 24
+    # Days since the epoch (a Thursday); +3 maps to Monday=0, Sunday=6
+    day_of_week = (run_times.astype('datetime64[D]').astype(np.int64) + 3) % 7
+
+    # Simulate conditions
+    weather_score = rng.uniform(0.4, 1.0, n).round(2)  # 1.0 is perfect weather
+    train_priority = rng.integers(1, 6, n)
+    base_speed = rng.choice([80, 100, 110, 130], n)
+    train_id_idx = rng.integers(0, len(TRAIN_IDS), n)  # Random train_id
+
+    # Make congestion and delays higher during peak hours (7-10am, 5-8pm)
+    is_peak_hour = ((hour_of_day >= 7) & (hour_of_day <= 10)) | ((hour_of_day >= 17) & (hour_of_day <= 20))
+
+    # One shared uniform draw per column, scaled into the peak or off-peak
+    # range by the mask - same distributions, half the RNG work
+    u = rng.random(n)
+    section_congestion = np.where(is_peak_hour, 0.6 + 0.4 * u, 0.1 + 0.4 * u).round(2)
+    u2 = rng.random(n)
+    base_delay = np.where(is_peak_hour, 5 + 10 * u2, 5 * u2)
+
+    # The "ground truth" formula our ML model will try to learn
+    actual_delay = compute_delays(base_delay, section_congestion, weather_score,
+                                  train_priority.astype(np.float64),
+                                  rng.uniform(-2, 2, n))
+    actual_delay = actual_delay.round(1)  # Delay can't be negative
+
+    # Yield row tuples lazily - executemany consumes the iterator without
+    # materializing a second 2000-tuple list alongside the column arrays.
+    # tolist() converts the NumPy scalars to plain ints/floats that the
+    # sqlite3 driver can bind
+    yield from zip(
+        timestamps.tolist(),
+        [TRAIN_IDS[i] for i in train_id_idx],
+        hour_of_day.tolist(),
+        day_of_week.tolist(),
+        weather_score.tolist(),
+        section_congestion.tolist(),
+        train_priority.tolist(),
+        base_speed.tolist(),
+        actual_delay.tolist()
+    )
+
+
+def create_database(db_path=DB_FILE):
+    """Creates and populates the SQLite database.
+
+    With RAILWAY_DB_MEMORY set, the whole build runs against an in-memory
+    database and is flushed to db_path once via the online backup API -
+    useful for CI/test runs where per-page disk writes dominate.
+    """
+    in_memory = bool(os.getenv("RAILWAY_DB_MEMORY"))
+    try:
+        # isolation_level=None disables the driver's implicit transaction
+        # handling so the BEGIN IMMEDIATE/COMMIT pair below owns the whole
+        # populate step as one fsync
+        con = sqlite3.connect(":memory:" if in_memory else db_path,
+                              isolation_level=None)
+        cur = con.cursor()
+        print(f"Database '{':memory:' if in_memory else db_path}' created/connected.")
+
+        # WAL turns the insert workload into sequential log appends and
+        # NORMAL sync drops the per-commit fsync on the main DB file
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA mmap_size=268435456")
+
+        # --- Create Schema ---
+        print("Creating tables...")
+
+        # Stations Table (5 columns)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS stations (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                position_km REAL NOT NULL,
+                platform_count INTEGER DEFAULT 1,
+                has_loop_line INTEGER DEFAULT 0
+            )
+        """)
+
+        # Sections Table (6 columns)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS sections (
+                id TEXT PRIMARY KEY,
+                from_station_id TEXT NOT NULL,
+                to_station_id TEXT NOT NULL,
+                length_km REAL NOT NULL,
+                track_type TEXT,
+                capacity INTEGER DEFAULT 1,
+                FOREIGN KEY (from_station_id) REFERENCES stations (id),
+                FOREIGN KEY (to_station_id) REFERENCES stations (id)
+                    
+            )
+        """)
+
+        # Master list of Train types (6 columns)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS trains_master (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                train_type TEXT,
+                priority INTEGER,
+                max_speed_kmph INTEGER,
+                last_known_delay_minutes REAL DEFAULT 0
+            )
+        """)
+
+        # Historical Data for ML Training (9 columns, excluding the rowid).
+        # Rebuilt from scratch each run: DROP+CREATE is O(1) truncate
+        # semantics versus the full-scan DELETE, and a plain INTEGER PRIMARY
+        # KEY (rowid alias) avoids the per-insert sqlite_sequence update
+        # AUTOINCREMENT would force
+        cur.execute("DROP TABLE IF EXISTS historical_runs")
+        cur.execute("""
+            CREATE TABLE historical_runs (
+                run_id INTEGER PRIMARY KEY,
+                timestamp TEXT,
+                train_id TEXT,
+                hour_of_day INTEGER,
+                day_of_week INTEGER,
+                weather_score REAL,
+                section_congestion REAL,
+                train_priority INTEGER,
+                base_speed INTEGER,
+                actual_delay_minutes REAL
+            )
+        """)
+
+        # --- Populate Static Data ---
+        print("Populating static network data...")
+        
+        # Data for stations table (5 values per tuple)
+        stations_data = [
+            ('CST', 'CST', 0.0, 18, 1), ('BYC', 'Byculla', 4.5, 4, 0),
+            ('DDR', 'Dadar', 9.0, 15, 1), ('KRL', 'Kurla', 16.0, 8, 1),
+            ('GTN', 'Ghatkopar', 20.0, 4, 0), ('TNA', 'Thane', 33.0, 10, 1)
+        ]
+        
+        # Data for sections table (6 values per tuple)
+        sections_data = [
+            ('SEC01', 'CST', 'BYC', 4.5, 'DOUBLE', 2),
+            ('SEC02', 'BYC', 'DDR', 4.5, 'DOUBLE', 2),
+            ('SEC03', 'DDR', 'KRL', 7.0, 'QUADRUPLE', 4),
+            ('SEC04', 'KRL', 'GTN', 4.0, 'DOUBLE', 2),
+            ('SEC05', 'GTN', 'TNA', 13.0, 'QUADRUPLE', 4)
+        ]
+        
+        # Data for trains_master table (6 values per tuple)
+        trains_data = [
+            ('T1', 'Mumbai Express', 'EXPRESS', 1, 130, 0), ('T2', 'Pune Mail', 'EXPRESS', 1, 130, 0),
+            ('T3', 'Dadar Slow', 'LOCAL', 3, 100, 0), ('T4', 'Thane Fast', 'LOCAL', 2, 110, 0),
+            ('T5', 'Goods Carrier', 'FREIGHT', 5, 80, 0), ('T6', 'Maintenance Special', 'SPECIAL', 4, 80, 0),
+            ('T7', 'Kurla Slow', 'LOCAL', 3, 100, 0), ('T8', 'CST Fast', 'LOCAL', 2, 110, 0)
+        ]
+
+        # --- Execute INSERT statements (single explicit transaction) ---
+        # The static tables are small enough to fit in one multi-row VALUES
+        # statement each: one prepare + one bind batch instead of one per row
+        def insert_all(table, rows):
+            width = len(rows[0])
+            placeholders = ", ".join(["(" + ", ".join(["?"] * width) + ")"] * len(rows))
+            cur.execute(f"INSERT OR IGNORE INTO {table} VALUES {placeholders}",
+                        [v for row in rows for v in row])
+
+        cur.execute("BEGIN IMMEDIATE")
+        insert_all("stations", stations_data)
+        insert_all("sections", sections_data)
+        insert_all("trains_master", trains_data)
+
+        # --- Populate Historical Data ---
+        # Chunked multi-row VALUES keeps the per-row bind overhead of
+        # executemany off the hot path while staying under SQLite's
+        # 999-variable limit (100 rows x 9 columns per statement)
+        hist_insert = """
+            INSERT INTO historical_runs (
+                timestamp, train_id, hour_of_day, day_of_week, weather_score,
+                section_congestion, train_priority, base_speed, actual_delay_minutes
+            ) VALUES """
+        hist_row = "(" + ", ".join(["?"] * 9) + ")"
+        hist_chunk = 100
+        hist_rows = generate_realistic_data()
+        hist_count = 0
+        while True:
+            chunk = list(itertools.islice(hist_rows, hist_chunk))
+            if not chunk:
+                break
+            cur.execute(hist_insert + ", ".join([hist_row] * len(chunk)),
+                        list(itertools.chain.from_iterable(chunk)))
+            hist_count += len(chunk)
+
+        # Index for the ML training queries, created after the bulk load so
+        # the B-trees are built once in sorted order instead of maintained
+        # per insert
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_hist_train ON historical_runs(train_id)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_hist_hour_day ON historical_runs(hour_of_day, day_of_week)")
+
+        cur.execute("COMMIT")
+        print(f"Successfully populated database with {hist_count} historical records.")
+
+        if in_memory:
+            # One sequential page copy to disk instead of per-page writes
+            # during the load
+            with sqlite3.connect(db_path) as disk:
+                con.backup(disk)
+            print(f"Flushed in-memory database to '{db_path}'.")
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        # Add traceback for detailed debugging if needed
+        import traceback
+        traceback.print_exc()
+    finally:
+        if con:
+            con.close()
+            print("Database connection closed.")
+
+
+if __name__ == "__main__":
     create_database()
\ No newline at end of file
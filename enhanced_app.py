@@ -1,29 +1,103 @@
 
 # enhanced_app.py - REPLACE YOUR APP.PY WITH THIS
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, Response, request, render_template
 from flask_cors import CORS
 import datetime
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+import orjson
 from simulator import RailwayNetworkSimulator
 from models import NetworkState
 from enhanced_optimizer import AIEnhancedTrainScheduleOptimizer  # NEW
 from ml_predictor import TrainDelayPredictor  # NEW
 from time_series_analyzer import RailwayTimeSeriesAnalyzer  # NEW
+import ai_kernels
 
 app = Flask(__name__)
 CORS(app)
 
+# Pre-serialized topology arrays, rebuilt only when the simulator version
+# moves. orjson.Fragment splices the cached bytes into each response
+# without re-encoding hundreds of identical dicts per poll
+_topology = {'version': None, 'stations': None, 'sections': None}
+
+
+def _topology_fragments(simulator):
+    if _topology['version'] != simulator.version:
+        _topology['stations'] = orjson.Fragment(orjson.dumps(simulator.station_payload()))
+        _topology['sections'] = orjson.Fragment(orjson.dumps(simulator.section_payload()))
+        _topology['version'] = simulator.version
+    return _topology['stations'], _topology['sections']
+
+
+def ojson(obj):
+    """Serialize a response with orjson - C-level encoding that also
+    understands NumPy scalars, unlike jsonify's stdlib json"""
+    return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+                    mimetype='application/json')
+
 # Global instances
-simulator = None
 ml_predictor = TrainDelayPredictor()  # NEW: AI/ML predictor
+# Run one dummy batch through the model at import time so BLAS kernel
+# selection and sklearn's validation paths are resolved before the first
+# request instead of on it
+ml_predictor.predict_batch(np.zeros((1, 6)))
 time_series_analyzer = RailwayTimeSeriesAnalyzer()  # NEW: Pattern analyzer
 
-def initialize_simulator():
-    """Initialize the railway network simulator with AI components"""
-    global simulator
+# Pattern analysis runs on a single background worker so its statistics
+# never sit on the request path; responses serve the latest snapshot.
+# One worker also serializes access to the analyzer's internal state.
+_bg = ThreadPoolExecutor(max_workers=1)
+_last_patterns = {
+    'patterns': {},
+    'congestion_forecast': {},
+    'as_of': None
+}
+
+
+def _update_patterns(now, trains_snapshot, sections_snapshot):
+    """Background job: feed the analyzer and refresh the snapshot"""
+    global _last_patterns
+    time_series_analyzer.add_operational_data(now, trains_snapshot, sections_snapshot)
+    _last_patterns = {
+        'patterns': time_series_analyzer.analyze_peak_patterns(),
+        'congestion_forecast': time_series_analyzer.predict_next_hour_congestion(),
+        'as_of': now.isoformat()
+    }
+
+@lru_cache(maxsize=4096)
+def _cached_predict(minute_bucket, hour, weekday, w_bucket, c_bucket, priority, speed_bucket):
+    """Memoized delay prediction on quantized features.
+
+    Feature tuples repeat heavily across trains and requests within the
+    same minute; the minute_bucket key component rolls the cache forward
+    so stale scores age out without explicit invalidation.
+    """
+    return ml_predictor.predict_delay(
+        hour_of_day=hour,
+        day_of_week=weekday,
+        weather_score=w_bucket / 10,
+        section_congestion=c_bucket / 10,
+        train_priority=priority,
+        base_speed=speed_bucket * 5
+    )
+
+@lru_cache(maxsize=1)
+def get_simulator():
+    """Initialize the railway network simulator with AI components.
+
+    lru_cache makes the lazy init thread-safe under concurrent workers
+    and turns every later call into a cache hit, replacing the
+    per-request `if not simulator` branch and its re-init race.
+    """
     simulator = RailwayNetworkSimulator()
     simulator.create_sample_network()
     simulator.create_sample_trains(8)
+    ai_kernels.warm_up()  # Compile the numeric kernels before first request
     return simulator
 
 # Your existing routes here...
@@ -49,70 +123,79 @@ def train_records_page():
 @app.route('/api/network-status', methods=['GET'])
 def get_network_status():
     """Enhanced network status with AI predictions"""
-    if not simulator:
-        initialize_simulator()
-
-    # Get basic status
-    basic_status = {
-        'timestamp': datetime.datetime.now().isoformat(),
-        'stations': [{'id': s.id, 'name': s.name, 'positionkm': s.position_km, 
-                     'platforms': s.platform_count, 'hasloop': s.has_loop_line} 
-                    for s in simulator.stations],
-        'sections': [{'id': s.id, 'from': s.from_station.name, 'to': s.to_station.name,
-                     'lengthkm': s.length_km, 'tracktype': s.track_type.name,
-                     'capacity': s.capacity, 'isblocked': s.is_blocked} 
-                    for s in simulator.sections],
-        'trains': [{'id': t.id, 'name': t.name, 'type': t.train_type.name,
-                   'priority': t.priority, 'speed': t.max_speed_kmph,
-                   'origin': t.origin.name, 'destination': t.destination.name,
-                   'departure': t.scheduled_departure.isoformat(),
-                   'position': t.current_position, 'delay': t.delay_minutes} 
-                  for t in simulator.trains]
-    }
-
-    # Add AI predictions
-    train_predictions = {}
-    for train in simulator.trains:
-        current_time = datetime.datetime.now()
-        predicted_delay = ml_predictor.predict_delay(
-            hour_of_day=current_time.hour,
-            day_of_week=current_time.weekday(),
-            train_priority=train.priority,
-            base_speed=train.max_speed_kmph
-        )
-        risk_level = ml_predictor.get_risk_assessment(predicted_delay)
-        train_predictions[train.id] = {
+    simulator = get_simulator()
+
+    # One timestamp for the whole request - the per-train now() calls
+    # were a syscall per iteration
+    now = datetime.datetime.now()
+    minute_bucket = int(now.timestamp() // 60)
+    hour, weekday = now.hour, now.weekday()
+
+    # Dashboards poll aggressively; when nothing mutated the simulator and
+    # the prediction minute bucket hasn't rolled over, skip the whole
+    # pipeline with a 304
+    etag = f"{simulator.version}-{minute_bucket}"
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304)
+
+    # Static payload fields come from the simulator's cached rows; only
+    # the AI predictions are computed per request. One pass over the
+    # train objects collects ids and prediction inputs together - the
+    # later zip works on plain lists, not object attributes
+    train_rows = simulator.train_payload()
+    train_ids = []
+    delays = []
+    for t in simulator.trains:
+        train_ids.append(t.id)
+        # Good weather (0.8) with the model's default congestion (0.5) -
+        # this endpoint never passed section_congestion explicitly
+        delays.append(_cached_predict(minute_bucket, hour, weekday, 8, 5,
+                                      t.priority, round(t.max_speed_kmph / 5)))
+    # One digitize call classifies every train's risk level
+    risk_levels = ml_predictor.assess_risk_batch(delays)
+    train_predictions = {
+        train_id: {
             'predicted_delay': round(predicted_delay, 1),
             'risk_level': risk_level,
             'confidence': 0.85  # High confidence
         }
+        for train_id, predicted_delay, risk_level in zip(train_ids, delays, risk_levels)
+    }
 
-    # Add time series analysis
-    time_series_analyzer.add_operational_data(
-        datetime.datetime.now(), 
-        basic_status['trains'], 
-        basic_status['sections']
-    )
-    patterns = time_series_analyzer.analyze_peak_patterns()
-    congestion_prediction = time_series_analyzer.predict_next_hour_congestion()
+    stations_json, sections_json = _topology_fragments(simulator)
+    basic_status = {
+        'timestamp': now.isoformat(),
+        'stations': stations_json,
+        'sections': sections_json,
+        'trains': train_rows
+    }
+
+    # Hand the snapshot to the background analyzer and serve the previous
+    # analysis - the statistics lag one update but the request no longer
+    # waits on them
+    # The analyzer needs dict rows, not the serialized fragments
+    _bg.submit(_update_patterns, now, train_rows, simulator.section_payload())
+    snapshot = _last_patterns
 
     # Enhanced status with AI
     enhanced_status = {
         **basic_status,
         'ai_predictions': train_predictions,
-        'time_series_patterns': patterns,
-        'congestion_forecast': congestion_prediction,
+        'time_series_patterns': snapshot['patterns'],
+        'congestion_forecast': snapshot['congestion_forecast'],
+        'analysis_as_of': snapshot['as_of'],
         'ai_status': 'active',
         'ml_model_accuracy': '85%'
     }
 
-    return jsonify(enhanced_status)
+    response = ojson(enhanced_status)
+    response.set_etag(etag, weak=True)
+    return response
 
 @app.route('/api/ai-optimize', methods=['POST'])  # NEW ENDPOINT
 def ai_optimize():
     """Run AI-enhanced optimization with ML predictions"""
-    if not simulator:
-        initialize_simulator()
+    simulator = get_simulator()
 
     # Create network state
     network_state = NetworkState(
@@ -136,29 +219,25 @@ def ai_optimize():
         'confidence_level': 'High'
     }
 
-    return jsonify(enhanced_result)
+    return ojson(enhanced_result)
 
 @app.route('/api/ml-predictions', methods=['GET'])  # NEW ENDPOINT
 def get_ml_predictions():
     """Get AI/ML delay predictions for all trains"""
-    if not simulator:
-        initialize_simulator()
+    simulator = get_simulator()
 
     predictions = {}
     current_time = datetime.datetime.now()
+    minute_bucket = int(current_time.timestamp() // 60)
+    hour, weekday = current_time.hour, current_time.weekday()
 
-    for train in simulator.trains:
-        predicted_delay = ml_predictor.predict_delay(
-            hour_of_day=current_time.hour,
-            day_of_week=current_time.weekday(),
-            weather_score=0.8,  # Default good weather
-            section_congestion=0.6,  # Default medium congestion
-            train_priority=train.priority,
-            base_speed=train.max_speed_kmph
-        )
-
-        risk_level = ml_predictor.get_risk_assessment(predicted_delay)
+    # Default good weather (0.8) / medium congestion (0.6) buckets
+    delays = [_cached_predict(minute_bucket, hour, weekday, 8, 6,
+                              train.priority, round(train.max_speed_kmph / 5))
+              for train in simulator.trains]
+    risk_levels = ml_predictor.assess_risk_batch(delays)
 
+    for train, predicted_delay, risk_level in zip(simulator.trains, delays, risk_levels):
         predictions[train.id] = {
             'train_name': train.name,
             'predicted_delay_minutes': round(predicted_delay, 1),
@@ -167,7 +246,7 @@ def get_ml_predictions():
             'recommendation': f"Monitor closely - {risk_level} risk" if risk_level != "LOW" else "Normal monitoring"
         }
 
-    return jsonify({
+    return ojson({
         'predictions': predictions,
         'model_info': {
             'type': 'Linear Regression',
@@ -184,7 +263,7 @@ def get_pattern_analysis():
     congestion_forecast = time_series_analyzer.predict_next_hour_congestion()
     anomalies = time_series_analyzer.get_anomaly_detection()
 
-    return jsonify({
+    return ojson({
         'patterns': patterns,
         'forecast': congestion_forecast,
         'anomaly_detection': anomalies,
@@ -201,8 +280,7 @@ def optimize_schedule():
 @app.route('/api/what-if-scenario', methods=['POST'])  # NEW ENDPOINT
 def run_what_if_scenario():
     """Run what-if scenario analysis with AI predictions"""
-    if not simulator:
-        initialize_simulator()
+    simulator = get_simulator()
 
     data = request.json or {}
     scenario_type = data.get('scenario_type', 'delay')
@@ -214,43 +292,44 @@ def run_what_if_scenario():
         train_id = data.get('train_id', simulator.trains[0].id if simulator.trains else None)
         delay_minutes = {'low': 10, 'medium': 20, 'high': 40}.get(impact_severity, 20)
 
-        # Apply scenario
-        for train in simulator.trains:
-            if train.id == train_id:
-                original_delay = train.delay_minutes
-                train.delay_minutes = delay_minutes
-
-                # Predict cascading effects using ML
-                ml_impact = ml_predictor.predict_delay(
-                    hour_of_day=datetime.datetime.now().hour,
-                    day_of_week=datetime.datetime.now().weekday(),
-                    section_congestion=0.8,  # Higher congestion due to delay
-                    train_priority=train.priority,
-                    base_speed=train.max_speed_kmph
-                )
-
-                scenario_result = {
-                    'scenario': f'Delay simulation for {train.name}',
-                    'original_delay': original_delay,
-                    'simulated_delay': delay_minutes,
-                    'ml_predicted_impact': round(ml_impact, 1),
-                    'affected_trains': [t.id for t in simulator.trains if t.priority >= train.priority],
-                    'recommendations': [
-                        f'Hold lower priority trains for {delay_minutes} minutes',
-                        f'Consider alternate routing for freight trains',
-                        f'Alert passengers about {delay_minutes}min delay'
-                    ]
-                }
-
-                # Restore original state
-                train.delay_minutes = original_delay
-
-                return jsonify(scenario_result)
-
-    return jsonify({'error': 'Invalid scenario type'})
+        # O(1) index lookup instead of scanning every train for the id
+        train = simulator.trains_by_id.get(train_id)
+        if train is not None:
+            original_delay = train.delay_minutes
+            train.delay_minutes = delay_minutes
+            simulator.version += 1
+
+            # Predict cascading effects using ML
+            ml_impact = ml_predictor.predict_delay(
+                hour_of_day=datetime.datetime.now().hour,
+                day_of_week=datetime.datetime.now().weekday(),
+                section_congestion=0.8,  # Higher congestion due to delay
+                train_priority=train.priority,
+                base_speed=train.max_speed_kmph
+            )
+
+            scenario_result = {
+                'scenario': f'Delay simulation for {train.name}',
+                'original_delay': original_delay,
+                'simulated_delay': delay_minutes,
+                'ml_predicted_impact': round(ml_impact, 1),
+                'affected_trains': simulator.trains_at_or_above_priority(train.priority),
+                'recommendations': [
+                    f'Hold lower priority trains for {delay_minutes} minutes',
+                    f'Consider alternate routing for freight trains',
+                    f'Alert passengers about {delay_minutes}min delay'
+                ]
+            }
+
+            # Restore original state
+            train.delay_minutes = original_delay
+
+            return ojson(scenario_result)
+
+    return ojson({'error': 'Invalid scenario type'})
 
 if __name__ == '__main__':
-    initialize_simulator()
+    get_simulator()
     print("AI-Enhanced Train Traffic Control System - MVP")
     print("NEW FEATURES:")
     print("- ML-powered delay prediction")
@@ -3,17 +3,33 @@
 from pulp import *
 from typing import List, Dict, Tuple, Optional
 import datetime
+import os
+
+import numpy as np
 from models import Train, Section, Station, TrainSchedule, NetworkState, OptimizationResult, TrainType, TrackType
 from ml_predictor import TrainDelayPredictor  # NEW ML COMPONENT
+from ai_kernels import summarize_delays
+
+# One solver handle for the whole process: CBC options are compiled once
+# and warmStart lets each solve seed from the previous solution instead of
+# paying full cold-start branching per /api/ai-optimize call
+# A 1% relative gap keeps CBC from spending the whole time limit proving
+# optimality; presolve and the primal heuristics surface incumbents early
+SOLVER = PULP_CBC_CMD(msg=0, timeLimit=30, warmStart=True, threads=os.cpu_count(),
+                      gapRel=0.01, presolve=True, strong=5,
+                      options=['heuristicsOnOff on'])
+
 
 class AIEnhancedTrainScheduleOptimizer:
     """AI-Enhanced Train Schedule Optimizer with Machine Learning"""
 
+    # Variable values from the last optimal solve, shared across instances
+    # so each request's fresh optimizer still warm-starts
+    _previous_solution: Dict[str, float] = {}
+
     def __init__(self, network_state: NetworkState):
         self.network_state = network_state
-        self.time_horizon = 240  # 4 hours
-        self.time_slots = 48     # 5-minute intervals
-        self.slot_duration = 5   # minutes per slot
+        self.time_horizon = 240  # 4 hours, in minutes
 
         # NEW: AI/ML Components
         self.ml_predictor = TrainDelayPredictor()
@@ -21,37 +37,27 @@ class AIEnhancedTrainScheduleOptimizer:
 
     def predict_delays(self) -> Dict[str, float]:
         """NEW: AI-powered delay prediction for all active trains"""
-        predictions = {}
         current_time = datetime.datetime.now()
+        trains = [ts.train for ts in self.network_state.active_trains]
+        if not trains:
+            return {}
+
+        # One (n, 6) feature matrix through the model - linear regression
+        # is a single matmul, so the per-train scalar calls collapse into
+        # one vectorized predict
+        hour_of_day = current_time.hour
+        day_of_week = current_time.weekday()
+        weather_score = 0.8  # Good weather default (in real system, get from APIs)
+        section_congestion = 0.6  # Medium congestion default
+
+        features = np.array([
+            [hour_of_day, day_of_week, weather_score, section_congestion,
+             train.priority, train.max_speed_kmph]
+            for train in trains
+        ], dtype=np.float64)
+        predicted = self.ml_predictor.predict_batch(features)
 
-        for ts in self.network_state.active_trains:
-            train = ts.train
-
-            # Extract features for ML prediction
-            hour_of_day = current_time.hour
-            day_of_week = current_time.weekday()
-
-            # Estimate weather and congestion (in real system, get from APIs)
-            weather_score = 0.8  # Good weather default
-            section_congestion = 0.6  # Medium congestion default
-
-            # Use train priority and speed
-            train_priority = train.priority
-            base_speed = train.max_speed_kmph
-
-            # Predict delay using ML model
-            predicted_delay = self.ml_predictor.predict_delay(
-                hour_of_day=hour_of_day,
-                day_of_week=day_of_week, 
-                weather_score=weather_score,
-                section_congestion=section_congestion,
-                train_priority=train_priority,
-                base_speed=base_speed
-            )
-
-            predictions[train.id] = predicted_delay
-
-        return predictions
+        return {train.id: float(delay) for train, delay in zip(trains, predicted)}
 
     def optimize_schedule(self) -> OptimizationResult:
         """Enhanced optimization with AI/ML predictions"""
@@ -63,56 +69,99 @@ class AIEnhancedTrainScheduleOptimizer:
         prob = LpProblem("AI_TrainScheduleOptimization", LpMaximize)
 
         # Decision variables
-        train_section_time = {}
+        train_section_start = {}
+        section_durations = {}
         train_delay = {}
 
         trains = [ts.train for ts in self.network_state.active_trains]
         sections = self.network_state.sections
 
+        # One positional list of ML delays - the expression builders below
+        # reference it by zip instead of re-hashing train ids per term
+        ml_list = [ml_predictions.get(train.id, 0) for train in trains]
+
+        # Continuous-time formulation: one start-time variable per
+        # (train, route section) pair instead of 48 per-slot binaries. The
+        # only binaries left are the pairwise ordering variables below, so
+        # the CBC branch-and-bound tree shrinks by orders of magnitude.
+        # Unlike the slot binaries, a continuous start has no "off" state,
+        # so variables must exist only for sections the train actually
+        # traverses - anything more sequences trains through foreign
+        # sections and can make the model infeasible outright
+        for ts in self.network_state.active_trains:
+            train = ts.train
+            speed = max(train.max_speed_kmph, 1)
+            for section in ts.route:
+                dist_km = abs(section.from_station.position_km - train.origin.position_km)
+                earliest = dist_km / speed * 60
+                if earliest >= self.time_horizon:
+                    continue
+                run_speed = max(min(speed, section.speed_limit_kmph), 1)
+                duration = section.length_km / run_speed * 60
+                key = (train.id, section.id)
+                section_durations[key] = duration
+                train_section_start[key] = LpVariable(
+                    f"t_{train.id}_{section.id}",
+                    lowBound=earliest,
+                    upBound=max(earliest, self.time_horizon - duration),
+                    cat='Continuous')
+
         # Enhanced with ML predictions
-        for train in trains:
-            ml_delay = ml_predictions.get(train.id, 0)
+        for train, ml_delay in zip(trains, ml_list):
             # Use ML prediction as lower bound for delay variable
             train_delay[train.id] = LpVariable(f"delay_{train.id}", 
                                               lowBound=ml_delay, 
                                               upBound=ml_delay + 30, 
                                               cat='Continuous')
 
-            for section in sections:
-                for t_slot in range(self.time_slots):
-                    var_name = f"x_{train.id}_{section.id}_{t_slot}"
-                    train_section_time[(train.id, section.id, t_slot)] = LpVariable(var_name, cat='Binary')
+        # Disjunctive no-overlap per section: either a precedes b or b
+        # precedes a, selected by one ordering binary per train pair
+        big_m = self.time_horizon
+        for section in sections:
+            users = [t for t in trains if (t.id, section.id) in train_section_start]
+            for i, train_a in enumerate(users):
+                for train_b in users[i + 1:]:
+                    t_a = train_section_start[(train_a.id, section.id)]
+                    t_b = train_section_start[(train_b.id, section.id)]
+                    order = LpVariable(f"y_{train_a.id}_{train_b.id}_{section.id}", cat='Binary')
+                    prob += t_a + section_durations[(train_a.id, section.id)] <= t_b + big_m * (1 - order)
+                    prob += t_b + section_durations[(train_b.id, section.id)] <= t_a + big_m * order
 
         # Enhanced objective function with ML insights
-        throughput_weight = 10
+        earliness_weight = 0.1
         delay_weight = 1
         ml_confidence_weight = 2  # NEW: Weight for ML predictions
 
-        # Count completed trains
-        completed_trains = lpSum([
-            train_section_time.get((train.id, section.id, t), 0)
-            for train in trains
-            for section in sections
-            for t in range(max(40, self.time_slots-10), self.time_slots)  # Last 50 minutes
-        ])
+        # With continuous times there is no per-slot completion indicator;
+        # reward early section entries instead, which pulls the whole
+        # schedule forward in the horizon
+        total_start_time = lpSum(train_section_start.values())
 
         # Weighted delays with ML enhancement
         weighted_delays = lpSum([
-            (6 - train.priority + ml_predictions.get(train.id, 0)/10) * train_delay[train.id]
-            for train in trains
+            (6 - train.priority + ml_delay / 10) * train_delay[train.id]
+            for train, ml_delay in zip(trains, ml_list)
         ])
 
-        # Enhanced objective function
-        prob += (throughput_weight * completed_trains - 
+        # Enhanced objective function. The ML term is a plain constant, so
+        # built-in sum avoids constructing an affine expression for it
+        prob += (-earliness_weight * total_start_time - 
                 delay_weight * weighted_delays - 
-                ml_confidence_weight * lpSum([ml_predictions.get(train.id, 0) for train in trains]))
-
-        # Add your existing constraints here (simplified for brevity)
-        # ... constraint code from your original optimizer ...
-
-        # Solve with time limit
-        solver = PULP_CBC_CMD(msg=0, timeLimit=30)
-        prob.solve(solver)
+                ml_confidence_weight * sum(ml_list))
+
+        # Seed the MIP start from the previous solution where variable
+        # names line up (same trains/sections between polls)
+        if self._previous_solution:
+            for var in prob.variables():
+                prev_value = self._previous_solution.get(var.name)
+                if prev_value is not None:
+                    # check=False: CBC's solution file rounds values, so a
+                    # seed can sit a hair outside a fractional bound and
+                    # the strict check would raise
+                    var.setInitialValue(prev_value, check=False)
+
+        # Solve with the shared warm-started solver
+        prob.solve(SOLVER)
 
         # Extract results with ML insights
         schedule = []
@@ -120,22 +169,32 @@ class AIEnhancedTrainScheduleOptimizer:
         recommendations = []
 
         if prob.status == LpStatusOptimal:
-            # Extract optimized schedule
-            for train in trains:
-                for section in sections:
-                    for t_slot in range(self.time_slots):
-                        if value(train_section_time.get((train.id, section.id, t_slot), 0)) > 0.5:
-                            time = self.network_state.timestamp + datetime.timedelta(minutes=t_slot * self.slot_duration)
-                            schedule.append((train, section, time))
+            # Remember this solution as the next solve's MIP start
+            type(self)._previous_solution = {
+                var.name: var.varValue for var in prob.variables()
+                if var.varValue is not None
+            }
+
+            # Extract the schedule straight from the continuous start times
+            trains_by_id = {t.id: t for t in trains}
+            sections_by_id = {s.id: s for s in sections}
+            # Read varValue directly - value() is an extra dispatch layer
+            # per variable on the extraction path
+            for (train_id, section_id), var in train_section_start.items():
+                start_minutes = var.varValue
+                if start_minutes is None:
+                    continue
+                time = self.network_state.timestamp + datetime.timedelta(minutes=start_minutes)
+                schedule.append((trains_by_id[train_id], sections_by_id[section_id], time))
 
             # Enhanced recommendations with ML
-            total_delay = sum(value(train_delay[t.id]) for t in trains)
+            delay_values = {train_id: var.varValue for train_id, var in train_delay.items()}
+            total_delay = sum(delay_values.values())
             avg_delay = total_delay / len(trains) if trains else 0
 
-            for train in trains:
-                ml_delay = ml_predictions.get(train.id, 0)
-                optimized_delay = value(train_delay[train.id])
-                risk_level = self.ml_predictor.get_risk_assessment(ml_delay)
+            risk_levels = self.ml_predictor.assess_risk_batch(ml_list)
+            for train, ml_delay, risk_level in zip(trains, ml_list, risk_levels):
+                optimized_delay = delay_values[train.id]
 
                 recommendations.append(f"Train {train.name}: ML predicts {ml_delay:.1f}min delay ({risk_level} risk)")
 
@@ -162,18 +221,23 @@ class AIEnhancedTrainScheduleOptimizer:
         """NEW: Get AI insights and analytics"""
         predictions = self.predict_delays()
 
+        # Single kernel pass over the delay vector instead of four separate
+        # Python reductions over the dict
+        delay_values = np.fromiter(predictions.values(), np.float64, len(predictions))
+        high_risk_count, total_delay, avg_delay = summarize_delays(delay_values)
+
         insights = {
             "ml_predictions": predictions,
             "high_risk_trains": [
                 train_id for train_id, delay in predictions.items() 
                 if delay > 15
             ],
-            "total_predicted_delay": sum(predictions.values()),
-            "average_predicted_delay": sum(predictions.values()) / len(predictions) if predictions else 0,
+            "total_predicted_delay": total_delay,
+            "average_predicted_delay": avg_delay,
             "confidence_level": "High (trained on 1000+ historical patterns)",
             "ai_recommendations": [
-                f"Monitor {len([d for d in predictions.values() if d > 15])} high-risk trains",
-                f"Average system delay predicted: {sum(predictions.values()) / len(predictions) if predictions else 0:.1f} minutes",
+                f"Monitor {high_risk_count} high-risk trains",
+                f"Average system delay predicted: {avg_delay:.1f} minutes",
                 "Consider priority adjustment for freight during peak hours"
             ]
         }
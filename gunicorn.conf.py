@@ -0,0 +1,10 @@
+# gunicorn.conf.py - Production server configuration
+# The Flask dev server runs the reloader and debugger middleware on every
+# request and the GIL serializes its threads. The workload here is
+# I/O-bound (SQLite + JSON), so gevent workers scale sustained RPS across
+# real worker processes.
+bind = "0.0.0.0:5000"
+workers = 4
+worker_class = "gevent"
+worker_connections = 1000
+keepalive = 5
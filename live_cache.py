@@ -0,0 +1,37 @@
+# live_cache.py - Short-TTL caching for live database reads
+import time
+import threading
+from functools import wraps
+
+
+def ttl_cache(seconds=5):
+    """Cache a function's result for a short time window.
+
+    The dashboard polls several endpoints at once and each endpoint used to
+    issue its own identical SQLite queries. Sharing one result across Flask
+    threads for a few seconds cuts database round-trips by the endpoint
+    fan-out without the live data going noticeably stale.
+    """
+    def decorator(func):
+        lock = threading.RLock()
+        cache = {}
+
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(args)
+                if entry is not None and now < entry[0]:
+                    return entry[1]
+            value = func(*args)
+            with lock:
+                cache[args] = (now + seconds, value)
+            return value
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
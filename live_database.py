@@ -1,573 +1,783 @@
-# live_database.py - Live Database System for Charbagh Railway Station
-import sqlite3
-import json
-import random
-import datetime
-from datetime import timedelta
-import threading
-import time
-from typing import List, Dict, Tuple, Optional
-
-class CharbhaghLiveDatabase:
-    """Live database system for Charbagh Railway Station with 9 platforms"""
-    
-    def __init__(self, db_path="charbagh_live.db"):
-        self.db_path = db_path
-        self.platforms = list(range(1, 10))  # 9 platforms
-        self.live_updates_active = False
-        self.update_thread = None
-        self.initialize_database()
-        self.populate_initial_data()
-        
-    def initialize_database(self):
-        """Initialize SQLite database with comprehensive schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Trains table with comprehensive information
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS trains (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                train_number VARCHAR(10) UNIQUE,
-                train_name VARCHAR(100),
-                train_type VARCHAR(50),
-                origin_station VARCHAR(100),
-                destination_station VARCHAR(100),
-                scheduled_arrival DATETIME,
-                scheduled_departure DATETIME,
-                actual_arrival DATETIME,
-                actual_departure DATETIME,
-                platform_number INTEGER,
-                current_status VARCHAR(50),
-                delay_minutes INTEGER DEFAULT 0,
-                distance_km INTEGER,
-                max_speed INTEGER,
-                priority INTEGER,
-                passenger_capacity INTEGER,
-                current_occupancy INTEGER,
-                route_stations TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Platform status table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS platform_status (
-                platform_number INTEGER PRIMARY KEY,
-                current_train VARCHAR(10),
-                status VARCHAR(50),
-                next_arrival DATETIME,
-                next_departure DATETIME,
-                occupancy_duration INTEGER,
-                maintenance_status VARCHAR(50),
-                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Real-time events table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS live_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                train_number VARCHAR(10),
-                event_type VARCHAR(50),
-                platform_number INTEGER,
-                description TEXT,
-                severity VARCHAR(20)
-            )
-        ''')
-        
-        # Performance metrics table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS performance_metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                total_trains INTEGER,
-                on_time_trains INTEGER,
-                delayed_trains INTEGER,
-                avg_delay_minutes REAL,
-                platform_utilization REAL,
-                passenger_satisfaction REAL,
-                system_efficiency REAL,
-                conflicts_detected INTEGER,
-                conflicts_resolved INTEGER
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        
-    def populate_initial_data(self):
-        """Populate database with 2000+ realistic train records for Charbagh"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if data already exists
-            cursor.execute("SELECT COUNT(*) FROM trains")
-            if cursor.fetchone()[0] > 0:
-                print("✅ Database already contains data, skipping population")
-                conn.close()
-                return
-                
-            # Realistic train data for Charbagh Railway Station
-            train_types = [
-                ("Express", 70, 110, 1200, 5),
-                ("Superfast", 80, 130, 1400, 4),
-                ("Mail", 65, 100, 1800, 3),
-                ("Passenger", 50, 80, 800, 2),
-                ("Intercity", 75, 120, 1000, 4),
-                ("Rajdhani", 90, 160, 1500, 5),
-                ("Shatabdi", 85, 150, 1200, 5),
-                ("Duronto", 80, 140, 1600, 4),
-                ("Jan Shatabdi", 70, 120, 1000, 3),
-                ("Garib Rath", 75, 130, 1800, 3)
-            ]
-            
-            # Major stations connected to Charbagh
-            stations = [
-                "New Delhi", "Mumbai Central", "Kolkata", "Chennai Central", 
-                "Bangalore", "Hyderabad", "Pune", "Ahmedabad", "Jaipur",
-                "Patna", "Kanpur", "Allahabad", "Varanasi", "Gorakhpur",
-                "Bareilly", "Moradabad", "Agra", "Gwalior", "Bhopal",
-                "Indore", "Nagpur", "Raipur", "Bilaspur", "Jabalpur"
-            ]
-            
-            # Generate 2000+ train records
-            trains_data = []
-            base_date = datetime.datetime.now()
-            used_train_numbers = set()  # Track used train numbers to avoid duplicates
-            
-            for i in range(2500):  # Generate 2500 records
-                train_type, speed, max_speed, capacity, priority = random.choice(train_types)
-                
-                # Generate unique train number (realistic format)
-                train_number = None
-                max_attempts = 100  # Prevent infinite loop
-                attempts = 0
-                
-                while train_number is None and attempts < max_attempts:
-                    if train_type in ["Rajdhani", "Shatabdi"]:
-                        candidate = f"{random.randint(12000, 19999)}"  # Expanded range
-                    elif train_type == "Superfast":
-                        candidate = f"{random.randint(20000, 29999)}"  # Expanded range
-                    else:
-                        candidate = f"{random.randint(10000, 19999)}"  # Expanded range
-                    
-                    if candidate not in used_train_numbers:
-                        train_number = candidate
-                        used_train_numbers.add(train_number)
-                    
-                    attempts += 1
-                
-                # Fallback if we couldn't generate a unique number (very unlikely)
-                if train_number is None:
-                    train_number = f"{10000 + i}"  # Use sequential fallback
-                    used_train_numbers.add(train_number)
-                
-                # Generate realistic train name
-                origin = random.choice(stations)
-                destination = random.choice([s for s in stations if s != origin])
-                train_name = f"{origin} - {destination} {train_type}"
-                
-                # Generate schedule times (spread across week)
-                days_offset = random.randint(-3, 7)  # Past 3 days to future 7 days
-                base_time = base_date + timedelta(days=days_offset)
-                
-                arrival_hour = random.randint(0, 23)
-                arrival_minute = random.choice([0, 15, 30, 45])
-                scheduled_arrival = base_time.replace(
-                    hour=arrival_hour, 
-                    minute=arrival_minute, 
-                    second=0, 
-                    microsecond=0
-                )
-                
-                # Platform stay duration (15 minutes to 2 hours)
-                stay_duration = random.randint(15, 120)
-                scheduled_departure = scheduled_arrival + timedelta(minutes=stay_duration)
-                
-                # Generate delays and actual times
-                delay = random.choices(
-                    [0, 5, 10, 15, 20, 30, 45, 60, 90, 120],
-                    weights=[40, 20, 15, 10, 7, 4, 2, 1, 0.5, 0.5]
-                )[0]
-                
-                actual_arrival = scheduled_arrival + timedelta(minutes=delay)
-                actual_departure = scheduled_departure + timedelta(minutes=delay)
-                
-                # Assign platform (weighted distribution)
-                platform = random.choices(
-                    self.platforms,
-                    weights=[12, 15, 18, 15, 10, 10, 8, 7, 5]  # Some platforms busier
-                )[0]
-                
-                # Generate status based on timing
-                current_time = datetime.datetime.now()
-                if actual_departure < current_time:
-                    status = "Departed"
-                elif actual_arrival <= current_time < actual_departure:
-                    status = "At Platform"
-                elif scheduled_arrival <= current_time < actual_arrival:
-                    status = "Delayed"
-                else:
-                    status = "Scheduled"
-                
-                # Generate route stations
-                route_count = random.randint(5, 15)
-                route_stations = random.sample(stations, min(route_count, len(stations)))
-                route_json = json.dumps(route_stations)
-                
-                # Current occupancy
-                occupancy = random.randint(int(capacity * 0.4), capacity)
-                
-                # Distance
-                distance = random.randint(200, 2000)
-                
-                trains_data.append((
-                    train_number, train_name, train_type, origin, destination,
-                    scheduled_arrival, scheduled_departure, actual_arrival, actual_departure,
-                    platform, status, delay, distance, max_speed, priority,
-                    capacity, occupancy, route_json
-                ))
-            
-            # Insert all train data with error handling
-            try:
-                cursor.executemany('''
-                    INSERT INTO trains (
-                        train_number, train_name, train_type, origin_station, destination_station,
-                        scheduled_arrival, scheduled_departure, actual_arrival, actual_departure,
-                        platform_number, current_status, delay_minutes, distance_km, max_speed, 
-                        priority, passenger_capacity, current_occupancy, route_stations
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', trains_data)
-            except sqlite3.IntegrityError as e:
-                print(f"⚠️  Database integrity error during population: {e}")
-                print("🔄 Attempting to clear and repopulate database...")
-                
-                # Clear existing data and try again
-                cursor.execute("DELETE FROM trains")
-                cursor.execute("DELETE FROM platform_status")
-                cursor.execute("DELETE FROM live_events")
-                cursor.execute("DELETE FROM performance_metrics")
-                
-                # Try insertion again
-                cursor.executemany('''
-                    INSERT INTO trains (
-                        train_number, train_name, train_type, origin_station, destination_station,
-                        scheduled_arrival, scheduled_departure, actual_arrival, actual_departure,
-                        platform_number, current_status, delay_minutes, distance_km, max_speed, 
-                        priority, passenger_capacity, current_occupancy, route_stations
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', trains_data)
-            
-            # Initialize platform status
-            for platform in self.platforms:
-                cursor.execute('''
-                    INSERT INTO platform_status (
-                        platform_number, status, maintenance_status
-                    ) VALUES (?, ?, ?)
-                ''', (platform, "Available", "Operational"))
-        
-            conn.commit()
-            conn.close()
-            print(f"✅ Populated database with {len(trains_data)} train records for Charbagh Station")
-            
-        except Exception as e:
-            print(f"❌ Error during database population: {e}")
-            if 'conn' in locals():
-                conn.rollback()
-                conn.close()
-            raise
-        
-    def start_live_updates(self):
-        """Start live updates simulation"""
-        if not self.live_updates_active:
-            self.live_updates_active = True
-            self.update_thread = threading.Thread(target=self._live_update_loop, daemon=True)
-            self.update_thread.start()
-            print("🚀 Live updates started for Charbagh Railway Station")
-    
-    def stop_live_updates(self):
-        """Stop live updates"""
-        self.live_updates_active = False
-        if self.update_thread:
-            self.update_thread.join()
-        print("⏹️ Live updates stopped")
-    
-    def _live_update_loop(self):
-        """Continuous live updates simulation"""
-        while self.live_updates_active:
-            try:
-                self._simulate_real_time_updates()
-                time.sleep(30)  # Update every 30 seconds
-            except Exception as e:
-                print(f"Error in live updates: {e}")
-                time.sleep(60)
-    
-    def _simulate_real_time_updates(self):
-        """Simulate real-time train movements and updates"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        current_time = datetime.datetime.now()
-        
-        # Update train statuses based on current time
-        cursor.execute('''
-            UPDATE trains 
-            SET current_status = CASE
-                WHEN actual_departure < ? THEN 'Departed'
-                WHEN actual_arrival <= ? AND actual_departure > ? THEN 'At Platform'
-                WHEN scheduled_arrival <= ? AND actual_arrival > ? THEN 'Delayed'
-                ELSE current_status
-            END,
-            last_updated = ?
-        ''', (current_time, current_time, current_time, current_time, current_time, current_time))
-        
-        # Random delay updates (simulate real-world changes)
-        if random.random() < 0.1:  # 10% chance
-            cursor.execute('''
-                SELECT train_number FROM trains 
-                WHERE current_status IN ('Scheduled', 'Delayed') 
-                ORDER BY RANDOM() LIMIT 1
-            ''')
-            result = cursor.fetchone()
-            if result:
-                additional_delay = random.randint(5, 30)
-                cursor.execute('''
-                    UPDATE trains 
-                    SET delay_minutes = delay_minutes + ?,
-                        actual_arrival = datetime(actual_arrival, '+{} minutes'),
-                        actual_departure = datetime(actual_departure, '+{} minutes'),
-                        last_updated = ?
-                    WHERE train_number = ?
-                '''.format(additional_delay, additional_delay), 
-                (additional_delay, current_time, result[0]))
-                
-                # Log event
-                cursor.execute('''
-                    INSERT INTO live_events (train_number, event_type, description, severity)
-                    VALUES (?, ?, ?, ?)
-                ''', (result[0], "Delay Update", f"Additional delay of {additional_delay} minutes", "Medium"))
-        
-        # Update platform status
-        for platform in self.platforms:
-            cursor.execute('''
-                SELECT train_number FROM trains 
-                WHERE platform_number = ? AND current_status = 'At Platform'
-                LIMIT 1
-            ''', (platform,))
-            
-            current_train = cursor.fetchone()
-            status = "Occupied" if current_train else "Available"
-            
-            cursor.execute('''
-                UPDATE platform_status 
-                SET current_train = ?, status = ?, last_updated = ?
-                WHERE platform_number = ?
-            ''', (current_train[0] if current_train else None, status, current_time, platform))
-        
-        # Update performance metrics
-        cursor.execute('''
-            INSERT INTO performance_metrics (
-                total_trains, on_time_trains, delayed_trains, avg_delay_minutes,
-                platform_utilization, passenger_satisfaction, system_efficiency,
-                conflicts_detected, conflicts_resolved
-            )
-            SELECT 
-                COUNT(*) as total_trains,
-                COUNT(CASE WHEN delay_minutes = 0 THEN 1 END) as on_time_trains,
-                COUNT(CASE WHEN delay_minutes > 0 THEN 1 END) as delayed_trains,
-                AVG(CAST(delay_minutes AS REAL)) as avg_delay_minutes,
-                (SELECT COUNT(*) FROM platform_status WHERE status = 'Occupied') * 100.0 / 9 as platform_utilization,
-                CASE 
-                    WHEN AVG(CAST(delay_minutes AS REAL)) < 10 THEN 95.0
-                    WHEN AVG(CAST(delay_minutes AS REAL)) < 20 THEN 85.0
-                    ELSE 75.0
-                END as passenger_satisfaction,
-                CASE 
-                    WHEN AVG(CAST(delay_minutes AS REAL)) < 15 THEN 90.0
-                    WHEN AVG(CAST(delay_minutes AS REAL)) < 30 THEN 80.0
-                    ELSE 70.0
-                END as system_efficiency,
-                ? as conflicts_detected,
-                ? as conflicts_resolved
-            FROM trains 
-            WHERE DATE(scheduled_arrival) = DATE(?)
-        ''', (random.randint(0, 5), random.randint(0, 3), current_time.date()))
-        
-        conn.commit()
-        conn.close()
-    
-    def get_live_train_data(self) -> List[Dict]:
-        """Get current live train data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM trains 
-            WHERE DATE(scheduled_arrival) >= DATE('now', '-1 day')
-            ORDER BY scheduled_arrival
-        ''')
-        
-        columns = [desc[0] for desc in cursor.description]
-        trains = []
-        for row in cursor.fetchall():
-            train_dict = dict(zip(columns, row))
-            if train_dict['route_stations']:
-                train_dict['route_stations'] = json.loads(train_dict['route_stations'])
-            trains.append(train_dict)
-        
-        conn.close()
-        return trains
-    
-    def get_platform_status(self) -> List[Dict]:
-        """Get current platform status"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT ps.*, t.train_name, t.scheduled_departure 
-            FROM platform_status ps
-            LEFT JOIN trains t ON ps.current_train = t.train_number
-            ORDER BY ps.platform_number
-        ''')
-        
-        columns = [desc[0] for desc in cursor.description]
-        platforms = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return platforms
-    
-    def get_performance_metrics(self) -> Dict:
-        """Get latest performance metrics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM performance_metrics 
-            ORDER BY timestamp DESC LIMIT 1
-        ''')
-        
-        result = cursor.fetchone()
-        if result:
-            columns = [desc[0] for desc in cursor.description]
-            metrics = dict(zip(columns, result))
-        else:
-            metrics = {
-                'total_trains': 0, 'on_time_trains': 0, 'delayed_trains': 0,
-                'avg_delay_minutes': 0, 'platform_utilization': 0,
-                'passenger_satisfaction': 0, 'system_efficiency': 0,
-                'conflicts_detected': 0, 'conflicts_resolved': 0
-            }
-        
-        conn.close()
-        return metrics
-    
-    def detect_conflicts(self) -> List[Dict]:
-        """Detect potential conflicts and issues"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        conflicts = []
-        
-        # Platform conflicts
-        cursor.execute('''
-            SELECT platform_number, COUNT(*) as conflict_count,
-                   GROUP_CONCAT(train_number) as conflicting_trains
-            FROM trains 
-            WHERE current_status = 'At Platform' 
-            GROUP BY platform_number 
-            HAVING COUNT(*) > 1
-        ''')
-        
-        for row in cursor.fetchall():
-            conflicts.append({
-                'type': 'Platform Conflict',
-                'platform': row[0],
-                'severity': 'High',
-                'description': f"Platform {row[0]} has {row[1]} trains simultaneously",
-                'affected_trains': row[2].split(','),
-                'recommendation': f"Immediate intervention required for Platform {row[0]}"
-            })
-        
-        # Schedule conflicts (trains arriving too close)
-        cursor.execute('''
-            SELECT t1.train_number, t2.train_number, t1.platform_number,
-                   ABS(julianday(t1.scheduled_arrival) - julianday(t2.scheduled_arrival)) * 24 * 60 as time_diff
-            FROM trains t1, trains t2 
-            WHERE t1.platform_number = t2.platform_number 
-            AND t1.train_number < t2.train_number
-            AND ABS(julianday(t1.scheduled_arrival) - julianday(t2.scheduled_arrival)) * 24 * 60 < 15
-            AND t1.current_status IN ('Scheduled', 'Delayed')
-            AND t2.current_status IN ('Scheduled', 'Delayed')
-        ''')
-        
-        for row in cursor.fetchall():
-            conflicts.append({
-                'type': 'Schedule Conflict',
-                'platform': row[2],
-                'severity': 'Medium',
-                'description': f"Trains {row[0]} and {row[1]} scheduled too close ({row[3]:.1f} min apart)",
-                'affected_trains': [row[0], row[1]],
-                'recommendation': "Consider platform reassignment or schedule adjustment"
-            })
-        
-        conn.close()
-        return conflicts
-    
-    def get_analytics_data(self) -> Dict:
-        """Get comprehensive analytics data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Platform utilization
-        cursor.execute('''
-            SELECT platform_number, COUNT(*) as train_count,
-                   AVG(CAST(delay_minutes AS REAL)) as avg_delay
-            FROM trains 
-            WHERE DATE(scheduled_arrival) = DATE('now')
-            GROUP BY platform_number
-            ORDER BY platform_number
-        ''')
-        platform_analytics = [
-            {'platform': row[0], 'trains': row[1], 'avg_delay': row[2] or 0}
-            for row in cursor.fetchall()
-        ]
-        
-        # Train type distribution
-        cursor.execute('''
-            SELECT train_type, COUNT(*) as count,
-                   AVG(CAST(delay_minutes AS REAL)) as avg_delay
-            FROM trains 
-            GROUP BY train_type
-            ORDER BY count DESC
-        ''')
-        train_type_analytics = [
-            {'type': row[0], 'count': row[1], 'avg_delay': row[2] or 0}
-            for row in cursor.fetchall()
-        ]
-        
-        # Hourly traffic
-        cursor.execute('''
-            SELECT strftime('%H', scheduled_arrival) as hour, COUNT(*) as count
-            FROM trains 
-            WHERE DATE(scheduled_arrival) = DATE('now')
-            GROUP BY hour
-            ORDER BY hour
-        ''')
-        hourly_traffic = [
-            {'hour': int(row[0]), 'trains': row[1]}
-            for row in cursor.fetchall()
-        ]
-        
-        conn.close()
-        return {
-            'platform_analytics': platform_analytics,
-            'train_type_analytics': train_type_analytics,
-            'hourly_traffic': hourly_traffic
-        }
-
-# Global instance
+# live_database.py - Live Database System for Charbagh Railway Station
+import sqlite3
+import json
+import random
+import datetime
+from datetime import timedelta
+import threading
+import time
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+
+
+@lru_cache(maxsize=4096)
+def _parse_route(route_json):
+    """Route blobs repeat heavily across trains (they are drawn from a
+    small pool), so each distinct string is JSON-parsed exactly once"""
+    return json.loads(route_json)
+
+
+class CharbhaghLiveDatabase:
+    """Live database system for Charbagh Railway Station with 9 platforms"""
+    
+    def __init__(self, db_path="charbagh_live.db"):
+        self.db_path = db_path
+        self.platforms = list(range(1, 10))  # 9 platforms
+        self.update_thread = None
+        self._stop_event = threading.Event()  # Set once to shut the update thread down
+        self._dirty = threading.Event()  # Signalled by writers so the update thread wakes early
+        self.generation = 0  # Bumped whenever live data changes, drives response ETags
+        self._local = threading.local()  # One persistent connection per thread
+        self._max_train_id = None  # Cached MAX(id), used for random sampling
+        # Aggregation results cached per data generation - dashboards poll
+        # these getters far more often than the 30s tick rewrites the data
+        self._metrics_cache = None
+        self._analytics_cache = None
+        self.initialize_database()
+        self.populate_initial_data()
+        
+    @staticmethod
+    def _tune_connection(conn):
+        """Apply the WAL/caching pragmas every connection should carry.
+
+        WAL lets the 30-second update thread write while dashboard reads
+        proceed; NORMAL sync drops the per-commit fsync on the main file;
+        the rest keep sorts, pages and reads in memory.
+        """
+        conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA cache_size=-65536;"
+        )
+
+    def _get_connection(self):
+        """Return this thread's persistent tuned connection.
+
+        Opening and closing a connection per query threw away SQLite's page
+        cache on every call; each thread now keeps one connection with the
+        tuned pragmas applied once, and rows come back as sqlite3.Row.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._tune_connection(conn)
+            self._local.conn = conn
+        return conn
+
+    def initialize_database(self):
+        """Initialize SQLite database with comprehensive schema"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # Trains table with comprehensive information
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trains (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                train_number VARCHAR(10) UNIQUE,
+                train_name VARCHAR(100),
+                train_type VARCHAR(50),
+                origin_station VARCHAR(100),
+                destination_station VARCHAR(100),
+                scheduled_arrival DATETIME,
+                scheduled_departure DATETIME,
+                actual_arrival DATETIME,
+                actual_departure DATETIME,
+                platform_number INTEGER,
+                current_status VARCHAR(50),
+                delay_minutes INTEGER DEFAULT 0,
+                distance_km INTEGER,
+                max_speed INTEGER,
+                priority INTEGER,
+                passenger_capacity INTEGER,
+                current_occupancy INTEGER,
+                route_stations TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Platform status table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS platform_status (
+                platform_number INTEGER PRIMARY KEY,
+                current_train VARCHAR(10),
+                status VARCHAR(50),
+                next_arrival DATETIME,
+                next_departure DATETIME,
+                occupancy_duration INTEGER,
+                maintenance_status VARCHAR(50),
+                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Real-time events table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS live_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                train_number VARCHAR(10),
+                event_type VARCHAR(50),
+                platform_number INTEGER,
+                description TEXT,
+                severity VARCHAR(20)
+            )
+        ''')
+        
+        # Performance metrics table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS performance_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                total_trains INTEGER,
+                on_time_trains INTEGER,
+                delayed_trains INTEGER,
+                avg_delay_minutes REAL,
+                platform_utilization REAL,
+                passenger_satisfaction REAL,
+                system_efficiency REAL,
+                conflicts_detected INTEGER,
+                conflicts_resolved INTEGER
+            )
+        ''')
+        
+        # Covering index so status/delay aggregations are satisfied from
+        # the index without touching the table rows
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_trains_status_arrival
+            ON trains(current_status, scheduled_arrival, delay_minutes)
+        ''')
+
+        # Indexes for the hot query predicates: arrival-window filters,
+        # per-platform occupancy lookups, type aggregation and event feeds.
+        # Without them every 30-second tick full-scans 2500 rows
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_trains_sched_arrival
+            ON trains(scheduled_arrival)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_trains_platform_status
+            ON trains(platform_number, current_status)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_trains_type
+            ON trains(train_type)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_ts
+            ON live_events(timestamp)
+        ''')
+
+        conn.commit()
+
+    def populate_initial_data(self):
+        """Populate database with 2000+ realistic train records for Charbagh"""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            
+            # Check if data already exists - EXISTS stops at the first row
+            # instead of counting the whole table
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM trains LIMIT 1)")
+            if cursor.fetchone()[0]:
+                print("✅ Database already contains data, skipping population")
+                return
+                
+            # Realistic train data for Charbagh Railway Station
+            train_types = [
+                ("Express", 70, 110, 1200, 5),
+                ("Superfast", 80, 130, 1400, 4),
+                ("Mail", 65, 100, 1800, 3),
+                ("Passenger", 50, 80, 800, 2),
+                ("Intercity", 75, 120, 1000, 4),
+                ("Rajdhani", 90, 160, 1500, 5),
+                ("Shatabdi", 85, 150, 1200, 5),
+                ("Duronto", 80, 140, 1600, 4),
+                ("Jan Shatabdi", 70, 120, 1000, 3),
+                ("Garib Rath", 75, 130, 1800, 3)
+            ]
+            
+            # Major stations connected to Charbagh
+            stations = [
+                "New Delhi", "Mumbai Central", "Kolkata", "Chennai Central", 
+                "Bangalore", "Hyderabad", "Pune", "Ahmedabad", "Jaipur",
+                "Patna", "Kanpur", "Allahabad", "Varanasi", "Gorakhpur",
+                "Bareilly", "Moradabad", "Agra", "Gwalior", "Bhopal",
+                "Indore", "Nagpur", "Raipur", "Bilaspur", "Jabalpur"
+            ]
+            
+            # Generate 2000+ train records. All random attributes are drawn
+            # in bulk NumPy calls instead of ~10 random.* invocations inside
+            # a 2500-iteration Python loop
+            n = 2500
+            trains_data = []
+            base_date = datetime.datetime.now()
+            rng = np.random.default_rng()
+
+            type_indices = rng.integers(0, len(train_types), n)
+            origin_indices = rng.integers(0, len(stations), n)
+            # Offset by 1..len-1 so the destination always differs
+            destination_indices = (origin_indices + rng.integers(1, len(stations), n)) % len(stations)
+            day_offsets = rng.integers(-3, 8, n)  # Past 3 days to future 7 days
+            arrival_hours = rng.integers(0, 24, n)
+            arrival_minutes = rng.choice([0, 15, 30, 45], n)
+            stay_durations = rng.integers(15, 121, n)  # 15 minutes to 2 hours
+
+            delay_values = np.array([0, 5, 10, 15, 20, 30, 45, 60, 90, 120])
+            delay_weights = np.array([40, 20, 15, 10, 7, 4, 2, 1, 0.5, 0.5])
+            delays = rng.choice(delay_values, n, p=delay_weights / delay_weights.sum())
+
+            platform_weights = np.array([12, 15, 18, 15, 10, 10, 8, 7, 5])  # Some platforms busier
+            platform_picks = rng.choice(self.platforms, n, p=platform_weights / platform_weights.sum())
+            occupancy_fractions = rng.uniform(0.4, 1.0, n)
+            distances = rng.integers(200, 2001, n)
+
+            # Routes are decorative, so serialize a pool of candidates once
+            # and pick from it instead of json.dumps per train
+            route_pool = [
+                json.dumps([stations[j] for j in rng.permutation(len(stations))[:k]])
+                for k in range(5, 16) for _ in range(4)
+            ]
+            route_picks = rng.integers(0, len(route_pool), n)
+
+            # Allocate unique train numbers from each range up front - the
+            # old per-train retry loop degrades as the used set fills
+            chosen_types = [train_types[j][0] for j in type_indices]
+            used_numbers = set()
+
+            def allocate_numbers(low, high, count):
+                pool = sorted(set(range(low, high)) - used_numbers)
+                picked = random.sample(pool, count)
+                used_numbers.update(picked)
+                return iter([str(p) for p in picked])
+
+            rajshat_count = sum(1 for t in chosen_types if t in ("Rajdhani", "Shatabdi"))
+            superfast_count = sum(1 for t in chosen_types if t == "Superfast")
+            rajshat_numbers = allocate_numbers(12000, 20000, rajshat_count)
+            superfast_numbers = allocate_numbers(20000, 30000, superfast_count)
+            other_numbers = allocate_numbers(10000, 20000, n - rajshat_count - superfast_count)
+
+            # Build the four schedule columns as datetime64 arithmetic and
+            # classify every status in one branchless np.select pass
+            day0 = np.datetime64(base_date.date())
+            sched_arr = ((day0 + day_offsets.astype('timedelta64[D]')).astype('datetime64[m]')
+                         + (arrival_hours * 60 + arrival_minutes).astype('timedelta64[m]'))
+            sched_dep = sched_arr + stay_durations.astype('timedelta64[m]')
+            act_arr = sched_arr + delays.astype('timedelta64[m]')
+            act_dep = sched_dep + delays.astype('timedelta64[m]')
+
+            now64 = np.datetime64(datetime.datetime.now().replace(microsecond=0))
+            statuses = np.select(
+                [act_dep < now64,
+                 (act_arr <= now64) & (act_dep > now64),
+                 (sched_arr <= now64) & (act_arr > now64)],
+                ["Departed", "At Platform", "Delayed"],
+                default="Scheduled").tolist()
+
+            # tolist() hands back plain datetimes the sqlite3 driver binds
+            sched_arr = sched_arr.astype('datetime64[s]').tolist()
+            sched_dep = sched_dep.astype('datetime64[s]').tolist()
+            act_arr = act_arr.astype('datetime64[s]').tolist()
+            act_dep = act_dep.astype('datetime64[s]').tolist()
+            for i in range(n):
+                train_type, speed, max_speed, capacity, priority = train_types[type_indices[i]]
+
+                # Take the next pre-allocated unique number for this type
+                if train_type in ("Rajdhani", "Shatabdi"):
+                    train_number = next(rajshat_numbers)
+                elif train_type == "Superfast":
+                    train_number = next(superfast_numbers)
+                else:
+                    train_number = next(other_numbers)
+
+                # Generate realistic train name
+                origin = stations[origin_indices[i]]
+                destination = stations[destination_indices[i]]
+                train_name = f"{origin} - {destination} {train_type}"
+
+                # Schedule columns and status were computed vectorized above
+                scheduled_arrival = sched_arr[i]
+                scheduled_departure = sched_dep[i]
+                actual_arrival = act_arr[i]
+                actual_departure = act_dep[i]
+                delay = int(delays[i])
+                platform = int(platform_picks[i])
+                status = statuses[i]
+
+                route_json = route_pool[route_picks[i]]
+                occupancy = int(capacity * occupancy_fractions[i])
+                distance = int(distances[i])
+
+                trains_data.append((
+                    train_number, train_name, train_type, origin, destination,
+                    scheduled_arrival, scheduled_departure, actual_arrival, actual_departure,
+                    platform, status, delay, distance, max_speed, priority,
+                    capacity, occupancy, route_json
+                ))
+            
+            # One explicit transaction around the whole load - without it
+            # any fallback to per-row autocommit costs an fsync per insert
+            cursor.execute("BEGIN IMMEDIATE")
+
+            # Insert all train data with error handling
+            try:
+                cursor.executemany('''
+                    INSERT INTO trains (
+                        train_number, train_name, train_type, origin_station, destination_station,
+                        scheduled_arrival, scheduled_departure, actual_arrival, actual_departure,
+                        platform_number, current_status, delay_minutes, distance_km, max_speed, 
+                        priority, passenger_capacity, current_occupancy, route_stations
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', trains_data)
+            except sqlite3.IntegrityError as e:
+                print(f"⚠️  Database integrity error during population: {e}")
+                print("🔄 Attempting to clear and repopulate database...")
+                
+                # Clear existing data and try again
+                cursor.execute("DELETE FROM trains")
+                cursor.execute("DELETE FROM platform_status")
+                cursor.execute("DELETE FROM live_events")
+                cursor.execute("DELETE FROM performance_metrics")
+                
+                # Try insertion again
+                cursor.executemany('''
+                    INSERT INTO trains (
+                        train_number, train_name, train_type, origin_station, destination_station,
+                        scheduled_arrival, scheduled_departure, actual_arrival, actual_departure,
+                        platform_number, current_status, delay_minutes, distance_km, max_speed, 
+                        priority, passenger_capacity, current_occupancy, route_stations
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', trains_data)
+            
+            # Initialize platform status in one batch
+            cursor.executemany('''
+                INSERT INTO platform_status (
+                    platform_number, status, maintenance_status
+                ) VALUES (?, ?, ?)
+            ''', [(platform, "Available", "Operational")
+                  for platform in self.platforms])
+        
+            conn.commit()
+
+            # Collect table statistics so the planner knows the real
+            # cardinalities (9 platforms, 4 statuses, ~10 types) and picks
+            # index-driven plans instead of heuristics or transient
+            # automatic indexes in the conflict/analytics queries
+            cursor.execute("ANALYZE")
+            print(f"✅ Populated database with {len(trains_data)} train records for Charbagh Station")
+            
+        except Exception as e:
+            print(f"❌ Error during database population: {e}")
+            if 'conn' in locals():
+                # Roll back but keep the thread's pooled connection open
+                conn.rollback()
+            raise
+        
+    @property
+    def live_updates_active(self):
+        return self.update_thread is not None and not self._stop_event.is_set()
+
+    def start_live_updates(self):
+        """Start live updates simulation"""
+        if not self.live_updates_active:
+            self._stop_event.clear()
+            self.update_thread = threading.Thread(target=self._live_update_loop, daemon=True)
+            self.update_thread.start()
+            print("🚀 Live updates started for Charbagh Railway Station")
+    
+    def stop_live_updates(self):
+        """Stop live updates"""
+        self._stop_event.set()  # Wakes the loop immediately, even mid-wait
+        self._dirty.set()
+        if self.update_thread:
+            self.update_thread.join()
+            self.update_thread = None
+        print("⏹️ Live updates stopped")
+
+    def notify_change(self):
+        """Signal the update thread that data changed.
+
+        Write paths (optimization, reoptimization) call this so the thread
+        refreshes immediately instead of sleeping out the poll interval.
+        """
+        self.generation += 1
+        self._dirty.set()
+
+    def _pick_random_active_train(self, cursor):
+        """Sample one Scheduled/Delayed train via a random rowid probe.
+
+        ORDER BY RANDOM() LIMIT 1 sorted the whole filtered set every
+        tick; probing a random id and walking forward is an O(log N)
+        primary-key lookup. A few retries cover probes landing past the
+        last active train.
+        """
+        if self._max_train_id is None:
+            cursor.execute("SELECT MAX(id) FROM trains")
+            self._max_train_id = cursor.fetchone()[0] or 0
+        for _ in range(5):
+            probe = random.randint(1, max(self._max_train_id, 1))
+            cursor.execute('''
+                SELECT train_number FROM trains 
+                WHERE id >= ? AND current_status IN ('Scheduled', 'Delayed') 
+                ORDER BY id LIMIT 1
+            ''', (probe,))
+            row = cursor.fetchone()
+            if row:
+                return row
+        return None
+
+    def _live_update_loop(self):
+        """Continuous live updates simulation"""
+        while not self._stop_event.is_set():
+            try:
+                self._simulate_real_time_updates()
+                # Wait for the next tick, waking early if a writer signals
+                # or shutdown is requested
+                self._dirty.wait(timeout=30)
+                self._dirty.clear()
+            except Exception as e:
+                print(f"Error in live updates: {e}")
+                self._stop_event.wait(60)
+    
+    def _simulate_real_time_updates(self):
+        """Simulate real-time train movements and updates"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        current_time = datetime.datetime.now()
+        day_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_end = day_start + timedelta(days=1)
+        
+        # All of this tick's writes land as one transaction/fsync
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Update train statuses based on current time
+        cursor.execute('''
+            UPDATE trains 
+            SET current_status = CASE
+                WHEN actual_departure < ? THEN 'Departed'
+                WHEN actual_arrival <= ? AND actual_departure > ? THEN 'At Platform'
+                WHEN scheduled_arrival <= ? AND actual_arrival > ? THEN 'Delayed'
+                ELSE current_status
+            END,
+            last_updated = ?
+        ''', (current_time, current_time, current_time, current_time, current_time, current_time))
+        
+        # Random delay updates (simulate real-world changes)
+        if random.random() < 0.1:  # 10% chance
+            result = self._pick_random_active_train(cursor)
+            if result:
+                additional_delay = random.randint(5, 30)
+                # Constant statement text with the delay bound as a
+                # parameter, so SQLite's statement cache hits across ticks
+                # instead of re-preparing a new SQL string per delay value
+                cursor.execute('''
+                    UPDATE trains 
+                    SET delay_minutes = delay_minutes + ?,
+                        actual_arrival = datetime(actual_arrival, '+' || ? || ' minutes'),
+                        actual_departure = datetime(actual_departure, '+' || ? || ' minutes'),
+                        last_updated = ?
+                    WHERE train_number = ?
+                ''', (additional_delay, additional_delay, additional_delay,
+                      current_time, result[0]))
+                
+                # Log event
+                cursor.execute('''
+                    INSERT INTO live_events (train_number, event_type, description, severity)
+                    VALUES (?, ?, ?, ?)
+                ''', (result[0], "Delay Update", f"Additional delay of {additional_delay} minutes", "Medium"))
+        
+        # Update platform status with one set-based statement - the old
+        # loop ran a SELECT plus an UPDATE per platform (18 statements per
+        # tick); this is 9 probes of idx_trains_platform_status inside a
+        # single prepared statement
+        cursor.execute('''
+            UPDATE platform_status 
+            SET current_train = (
+                    SELECT train_number FROM trains 
+                    WHERE platform_number = platform_status.platform_number 
+                    AND current_status = 'At Platform' 
+                    LIMIT 1
+                ),
+                status = CASE WHEN EXISTS (
+                    SELECT 1 FROM trains 
+                    WHERE platform_number = platform_status.platform_number 
+                    AND current_status = 'At Platform'
+                ) THEN 'Occupied' ELSE 'Available' END,
+                last_updated = ?
+        ''', (current_time,))
+        
+        # Update performance metrics
+        cursor.execute('''
+            INSERT INTO performance_metrics (
+                total_trains, on_time_trains, delayed_trains, avg_delay_minutes,
+                platform_utilization, passenger_satisfaction, system_efficiency,
+                conflicts_detected, conflicts_resolved
+            )
+            SELECT 
+                COUNT(*) as total_trains,
+                COUNT(CASE WHEN delay_minutes = 0 THEN 1 END) as on_time_trains,
+                COUNT(CASE WHEN delay_minutes > 0 THEN 1 END) as delayed_trains,
+                AVG(CAST(delay_minutes AS REAL)) as avg_delay_minutes,
+                (SELECT COUNT(*) FROM platform_status WHERE status = 'Occupied') * 100.0 / 9 as platform_utilization,
+                CASE 
+                    WHEN AVG(CAST(delay_minutes AS REAL)) < 10 THEN 95.0
+                    WHEN AVG(CAST(delay_minutes AS REAL)) < 20 THEN 85.0
+                    ELSE 75.0
+                END as passenger_satisfaction,
+                CASE 
+                    WHEN AVG(CAST(delay_minutes AS REAL)) < 15 THEN 90.0
+                    WHEN AVG(CAST(delay_minutes AS REAL)) < 30 THEN 80.0
+                    ELSE 70.0
+                END as system_efficiency,
+                ? as conflicts_detected,
+                ? as conflicts_resolved
+            FROM trains 
+            WHERE scheduled_arrival >= ? AND scheduled_arrival < ?
+        ''', (random.randint(0, 5), random.randint(0, 3), day_start, day_end))
+        
+        conn.commit()
+        self.generation += 1
+
+    def get_live_train_data(self) -> List[Dict]:
+        """Get current live train data"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # Half-open range on the bare column so idx_trains_sched_arrival
+        # applies - wrapping the column in DATE() would disable it
+        cutoff = (datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                  - timedelta(days=1))
+        cursor.execute('''
+            SELECT * FROM trains 
+            WHERE scheduled_arrival >= ?
+            ORDER BY scheduled_arrival
+        ''', (cutoff,))
+        
+        rows = cursor.fetchall()
+        # sqlite3.Row shares one column map per result set - its keys()
+        # replaces the per-call cursor.description scan, and zip reads the
+        # row values positionally with no name lookups
+        columns = rows[0].keys() if rows else ()
+        trains = []
+        for row in rows:
+            train_dict = dict(zip(columns, row))
+            if train_dict['route_stations']:
+                train_dict['route_stations'] = _parse_route(train_dict['route_stations'])
+            trains.append(train_dict)
+
+        return trains
+    
+    def get_platform_status(self) -> List[Dict]:
+        """Get current platform status"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT ps.*, t.train_name, t.scheduled_departure 
+            FROM platform_status ps
+            LEFT JOIN trains t ON ps.current_train = t.train_number
+            ORDER BY ps.platform_number
+        ''')
+        
+        rows = cursor.fetchall()
+        columns = rows[0].keys() if rows else ()
+        platforms = [dict(zip(columns, row)) for row in rows]
+
+        return platforms
+    
+    def get_performance_metrics(self) -> Dict:
+        """Get latest performance metrics"""
+        if self._metrics_cache is not None and self._metrics_cache[0] == self.generation:
+            return self._metrics_cache[1]
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT * FROM performance_metrics 
+            ORDER BY timestamp DESC LIMIT 1
+        ''')
+        
+        result = cursor.fetchone()
+        if result:
+            metrics = dict(zip(result.keys(), result))
+        else:
+            metrics = {
+                'total_trains': 0, 'on_time_trains': 0, 'delayed_trains': 0,
+                'avg_delay_minutes': 0, 'platform_utilization': 0,
+                'passenger_satisfaction': 0, 'system_efficiency': 0,
+                'conflicts_detected': 0, 'conflicts_resolved': 0
+            }
+
+        self._metrics_cache = (self.generation, metrics)
+        return metrics
+    
+    def get_status_counts(self) -> Dict:
+        """Count trains per status with a single SQL aggregation"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT current_status, COUNT(*) FROM trains GROUP BY current_status
+        ''')
+        counts = {row[0]: row[1] for row in cursor.fetchall()}
+
+        return counts
+
+    def get_delay_stats(self, since_date) -> Dict:
+        """Aggregate delay KPIs server-side for trains arriving since a date.
+
+        One indexed scan in SQLite replaces several Python passes over the
+        full train list in the analytics endpoints.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT COUNT(*),
+                   COUNT(CASE WHEN delay_minutes = 0 THEN 1 END),
+                   COUNT(CASE WHEN delay_minutes > 0 AND delay_minutes <= 15 THEN 1 END),
+                   COUNT(CASE WHEN delay_minutes > 15 AND delay_minutes <= 30 THEN 1 END),
+                   COUNT(CASE WHEN delay_minutes > 30 THEN 1 END),
+                   COALESCE(SUM(delay_minutes), 0),
+                   COALESCE(SUM(MAX(delay_minutes - 30, 0)), 0)
+            FROM trains
+            WHERE scheduled_arrival >= ?
+        ''', (since_date,))
+        row = cursor.fetchone()
+
+        return {
+            'total': row[0],
+            'on_time': row[1],
+            'minor': row[2],
+            'moderate': row[3],
+            'major': row[4],
+            'total_delay_minutes': row[5],
+            'compensation_minutes': row[6]
+        }
+
+    def detect_conflicts(self) -> List[Dict]:
+        """Detect potential conflicts and issues"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        conflicts = []
+        
+        # Platform conflicts. json_group_array keeps the train list a real
+        # JSON array end to end instead of a comma-joined string that would
+        # break on commas in values
+        cursor.execute('''
+            SELECT platform_number, COUNT(*) as conflict_count,
+                   json_group_array(train_number) as conflicting_trains
+            FROM trains 
+            WHERE current_status = 'At Platform' 
+            GROUP BY platform_number 
+            HAVING COUNT(*) > 1
+        ''')
+        
+        for row in cursor.fetchall():
+            conflicts.append({
+                'type': 'Platform Conflict',
+                'platform': row[0],
+                'severity': 'High',
+                'description': f"Platform {row[0]} has {row[1]} trains simultaneously",
+                'affected_trains': json.loads(row[2]),
+                'recommendation': f"Immediate intervention required for Platform {row[0]}"
+            })
+        
+        # Schedule conflicts (trains arriving too close). Ordering each
+        # platform's arrivals and comparing neighbours via LAG replaces the
+        # old O(N^2) self-join - any pair closer than 15 minutes implies an
+        # adjacent pair closer than 15 minutes, so no conflicts are missed
+        cursor.execute('''
+            SELECT prev_train, train_number, platform_number,
+                   (julianday(scheduled_arrival) - julianday(prev_arrival)) * 24 * 60 as time_diff
+            FROM (
+                SELECT train_number, platform_number, scheduled_arrival,
+                       LAG(train_number) OVER w AS prev_train,
+                       LAG(scheduled_arrival) OVER w AS prev_arrival
+                FROM trains
+                WHERE current_status IN ('Scheduled', 'Delayed')
+                WINDOW w AS (PARTITION BY platform_number ORDER BY scheduled_arrival)
+            )
+            WHERE prev_train IS NOT NULL AND time_diff < 15
+        ''')
+        
+        for row in cursor.fetchall():
+            conflicts.append({
+                'type': 'Schedule Conflict',
+                'platform': row[2],
+                'severity': 'Medium',
+                'description': f"Trains {row[0]} and {row[1]} scheduled too close ({row[3]:.1f} min apart)",
+                'affected_trains': [row[0], row[1]],
+                'recommendation': "Consider platform reassignment or schedule adjustment"
+            })
+
+        return conflicts
+    
+    def get_analytics_data(self) -> Dict:
+        """Get comprehensive analytics data"""
+        if self._analytics_cache is not None and self._analytics_cache[0] == self.generation:
+            return self._analytics_cache[1]
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        today_start = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow_start = today_start + timedelta(days=1)
+
+        # Platform utilization
+        cursor.execute('''
+            SELECT platform_number, COUNT(*) as train_count,
+                   AVG(CAST(delay_minutes AS REAL)) as avg_delay
+            FROM trains 
+            WHERE scheduled_arrival >= ? AND scheduled_arrival < ?
+            GROUP BY platform_number
+            ORDER BY platform_number
+        ''', (today_start, tomorrow_start))
+        platform_analytics = [
+            {'platform': row[0], 'trains': row[1], 'avg_delay': row[2] or 0}
+            for row in cursor.fetchall()
+        ]
+        
+        # Train type distribution
+        cursor.execute('''
+            SELECT train_type, COUNT(*) as count,
+                   AVG(CAST(delay_minutes AS REAL)) as avg_delay
+            FROM trains 
+            GROUP BY train_type
+            ORDER BY count DESC
+        ''')
+        train_type_analytics = [
+            {'type': row[0], 'count': row[1], 'avg_delay': row[2] or 0}
+            for row in cursor.fetchall()
+        ]
+        
+        # Hourly traffic
+        cursor.execute('''
+            SELECT strftime('%H', scheduled_arrival) as hour, COUNT(*) as count
+            FROM trains 
+            WHERE scheduled_arrival >= ? AND scheduled_arrival < ?
+            GROUP BY hour
+            ORDER BY hour
+        ''', (today_start, tomorrow_start))
+        hourly_traffic = [
+            {'hour': int(row[0]), 'trains': row[1]}
+            for row in cursor.fetchall()
+        ]
+        
+        analytics = {
+            'platform_analytics': platform_analytics,
+            'train_type_analytics': train_type_analytics,
+            'hourly_traffic': hourly_traffic
+        }
+        self._analytics_cache = (self.generation, analytics)
+        return analytics
+
+# Global instance
 charbagh_db = CharbhaghLiveDatabase()
\ No newline at end of file
@@ -1,9 +1,9 @@
 # run_enhanced_system.py - Startup Script for Enhanced Railway Traffic Control System
 import sys
 import os
-import time
 import threading
 from datetime import datetime
+from importlib.util import find_spec
 
 def print_banner():
     """Display system startup banner"""
@@ -21,25 +21,22 @@ def check_dependencies():
     """Check if all required packages are installed"""
     print("\n🔍 Checking system dependencies...")
     
+    # (display name, importable module name)
     required_packages = [
-        'flask', 'flask_cors', 'pulp', 'numpy', 
-        'scikit-learn', 'pandas', 'sqlite3'
+        ('flask', 'flask'), ('flask_cors', 'flask_cors'), ('pulp', 'pulp'),
+        ('numpy', 'numpy'), ('scikit-learn', 'sklearn'),
+        ('pandas', 'pandas'), ('sqlite3', 'sqlite3')
     ]
-    
+
     missing_packages = []
-    
-    for package in required_packages:
-        try:
-            if package == 'flask_cors':
-                import flask_cors
-            elif package == 'scikit-learn':
-                import sklearn
-            elif package == 'sqlite3':
-                import sqlite3
-            else:
-                __import__(package)
+
+    # find_spec only asks the module finders whether the package exists;
+    # actually importing heavyweights like pandas here added seconds of
+    # module-init time before startup even began
+    for package, module_name in required_packages:
+        if find_spec(module_name) is not None:
             print(f"   ✅ {package}")
-        except ImportError:
+        else:
             print(f"   ❌ {package} - MISSING")
             missing_packages.append(package)
     
@@ -109,9 +106,10 @@ def display_feature_summary():
         "✅ Platform Efficiency: Real-time utilization optimization"
     ]
     
+    # Flushing per line keeps the progressive output without the old
+    # time.sleep(0.1) per feature, which cost 1.2s of startup on its own
     for feature in features:
-        print(f"   {feature}")
-        time.sleep(0.1)  # Dramatic effect
+        print(f"   {feature}", flush=True)
 
 def display_api_endpoints():
     """Display available API endpoints"""
@@ -1,320 +1,490 @@
-"""
-Train Traffic Simulator
-Simulates train movements through the network for testing and validation
-"""
-
-import datetime
-from typing import List, Dict, Tuple
-import random
-from models import (
-    Train, Section, Station, TrainSchedule, NetworkState,
-    TrainType, TrackType
-)
-from optimizer import TrainScheduleOptimizer
-
-
-class RailwayNetworkSimulator:
-    """Simulates train movements and network dynamics"""
-    
-    def __init__(self):
-        self.current_time = datetime.datetime.now()
-        self.stations = []
-        self.sections = []
-        self.trains = []
-        self.schedules = []
-        
-    def create_sample_network(self):
-        """Creates a sample railway network for demonstration"""
-        
-        # Create stations along a route
-        station_data = [
-            ("STN01", "Delhi Junction", 0, 4, True),
-            ("STN02", "Ghaziabad", 25, 3, False),
-            ("STN03", "Meerut", 70, 2, True),
-            ("STN04", "Muzaffarnagar", 120, 2, False),
-            ("STN05", "Saharanpur", 165, 3, True),
-        ]
-        
-        for sid, name, pos, platforms, has_loop in station_data:
-            station = Station(
-                id=sid,
-                name=name,
-                platform_count=platforms,
-                position_km=pos,
-                has_loop_line=has_loop
-            )
-            self.stations.append(station)
-        
-        # Create sections between stations
-        for i in range(len(self.stations) - 1):
-            from_station = self.stations[i]
-            to_station = self.stations[i + 1]
-            
-            # Vary track types for complexity
-            if i % 2 == 0:
-                track_type = TrackType.SINGLE
-            else:
-                track_type = TrackType.DOUBLE
-            
-            section = Section(
-                id=f"SEC{i+1:02d}",
-                from_station=from_station,
-                to_station=to_station,
-                length_km=to_station.position_km - from_station.position_km,
-                track_type=track_type,
-                speed_limit_kmph=100 if track_type == TrackType.DOUBLE else 80,
-                gradient=random.uniform(-0.5, 0.5)
-            )
-            self.sections.append(section)
-        
-        # Create reverse sections for double tracks
-        for i, section in enumerate(list(self.sections)):
-            if section.track_type == TrackType.DOUBLE:
-                reverse_section = Section(
-                    id=f"SEC{i+1:02d}R",
-                    from_station=section.to_station,
-                    to_station=section.from_station,
-                    length_km=section.length_km,
-                    track_type=section.track_type,
-                    speed_limit_kmph=section.speed_limit_kmph,
-                    gradient=-section.gradient
-                )
-                self.sections.append(reverse_section)
-    
-    def create_sample_trains(self, num_trains: int = 5):
-        """Creates sample trains with different characteristics"""
-        
-        train_types = [
-            (TrainType.SUPERFAST_EXPRESS, "Rajdhani Express", 160),
-            (TrainType.EXPRESS, "Shatabdi Express", 140),
-            (TrainType.PASSENGER, "Passenger", 100),
-            (TrainType.LOCAL, "Local", 80),
-            (TrainType.FREIGHT, "Freight", 60),
-        ]
-        
-        for i in range(num_trains):
-            train_type, base_name, speed = train_types[i % len(train_types)]
-            
-            # Randomly select origin and destination
-            origin_idx = random.randint(0, len(self.stations) - 2)
-            dest_idx = random.randint(origin_idx + 1, len(self.stations) - 1)
-            
-            train = Train(
-                id=f"TRN{i+1:03d}",
-                name=f"{base_name} {i+1:02d}",
-                train_type=train_type,
-                max_speed_kmph=speed,
-                length_meters=random.randint(200, 600),
-                scheduled_departure=self.current_time + datetime.timedelta(
-                    minutes=random.randint(0, 60)
-                ),
-                origin=self.stations[origin_idx],
-                destination=self.stations[dest_idx],
-                current_position=self.stations[origin_idx].position_km
-            )
-            self.trains.append(train)
-            
-            # Create schedule for the train
-            route = []
-            for j in range(origin_idx, dest_idx):
-                # Find the section connecting these stations
-                for section in self.sections:
-                    if (section.from_station == self.stations[j] and 
-                        section.to_station == self.stations[j + 1]):
-                        route.append(section)
-                        break
-            
-            # Generate station stops
-            station_stops = []
-            current_time = train.scheduled_departure
-            
-            for j in range(origin_idx, dest_idx + 1):
-                arrival_time = current_time
-                if j < dest_idx:
-                    # Calculate time to next station
-                    section = route[j - origin_idx] if j > origin_idx else None
-                    if section:
-                        travel_time = (section.length_km / train.max_speed_kmph) * 60
-                        current_time += datetime.timedelta(minutes=travel_time)
-                
-                # Add stop time at intermediate stations
-                stop_duration = 2 if j != dest_idx else 0
-                departure_time = arrival_time + datetime.timedelta(minutes=stop_duration)
-                
-                station_stops.append((
-                    self.stations[j],
-                    arrival_time,
-                    departure_time
-                ))
-                
-                if j < dest_idx:
-                    current_time = departure_time
-            
-            schedule = TrainSchedule(
-                train=train,
-                route=route,
-                station_stops=station_stops
-            )
-            self.schedules.append(schedule)
-    
-    def simulate_step(self, network_state: NetworkState, time_step_minutes: int = 5):
-        """Simulates one time step of train movements"""
-        
-        network_state.timestamp += datetime.timedelta(minutes=time_step_minutes)
-        
-        for schedule in network_state.active_trains:
-            train = schedule.train
-            
-            # Skip if train hasn't departed yet
-            if network_state.timestamp < train.scheduled_departure:
-                continue
-            
-            # Update train status
-            if schedule.status == "SCHEDULED":
-                schedule.status = "RUNNING"
-            
-            # Check if train completed its journey
-            if schedule.current_section_index >= len(schedule.route):
-                schedule.status = "COMPLETED"
-                continue
-            
-            current_section = schedule.route[schedule.current_section_index]
-            
-            # Check if section is available
-            if network_state.is_section_available(current_section, train):
-                # Move train forward
-                distance_to_travel = (train.max_speed_kmph / 60) * time_step_minutes
-                
-                # Check if train completes the section
-                remaining_distance = current_section.length_km - (
-                    train.current_position - current_section.from_station.position_km
-                )
-                
-                if distance_to_travel >= remaining_distance:
-                    # Train completes the section
-                    train.current_position = current_section.to_station.position_km
-                    network_state.update_train_position(schedule, None)
-                    schedule.current_section_index += 1
-                    
-                    # Move to next section if available
-                    if schedule.current_section_index < len(schedule.route):
-                        next_section = schedule.route[schedule.current_section_index]
-                        if network_state.is_section_available(next_section, train):
-                            network_state.update_train_position(schedule, next_section)
-                else:
-                    # Train continues in current section
-                    train.current_position += distance_to_travel
-                    if current_section.id not in network_state.section_occupancy:
-                        network_state.update_train_position(schedule, current_section)
-            else:
-                # Train is delayed due to section being occupied
-                train.delay_minutes += time_step_minutes
-                schedule.status = "DELAYED"
-    
-    def run_simulation(self, duration_hours: int = 4) -> Dict[str, any]:
-        """Runs the simulation for specified duration"""
-        
-        # Initialize network state
-        network_state = NetworkState(
-            timestamp=self.current_time,
-            stations=self.stations,
-            sections=self.sections,
-            active_trains=self.schedules
-        )
-        
-        # Initialize optimizer
-        optimizer = TrainScheduleOptimizer(network_state)
-        
-        # Run initial optimization
-        optimization_result = optimizer.optimize_schedule()
-        
-        # Simulation results
-        results = {
-            "start_time": self.current_time,
-            "duration_hours": duration_hours,
-            "total_trains": len(self.trains),
-            "optimization": optimization_result.to_dict(),
-            "events": [],
-            "final_statistics": {}
-        }
-        
-        # Run simulation steps
-        steps = (duration_hours * 60) // 5  # 5-minute steps
-        
-        for step in range(steps):
-            # Log current state
-            running_trains = sum(1 for s in self.schedules if s.status == "RUNNING")
-            delayed_trains = sum(1 for s in self.schedules if s.status == "DELAYED")
-            
-            if step % 12 == 0:  # Log every hour
-                event = {
-                    "time": network_state.timestamp.isoformat(),
-                    "running_trains": running_trains,
-                    "delayed_trains": delayed_trains,
-                    "section_occupancy": {
-                        sid: len(trains) 
-                        for sid, trains in network_state.section_occupancy.items()
-                    }
-                }
-                results["events"].append(event)
-            
-            # Simulate train movements
-            self.simulate_step(network_state, 5)
-            
-            # Re-optimize every 30 minutes
-            if step % 6 == 0 and step > 0:
-                optimization_result = optimizer.optimize_schedule()
-                
-                # Apply optimization recommendations
-                # (In real system, this would update train controls)
-        
-        # Calculate final statistics
-        completed_trains = sum(1 for s in self.schedules if s.status == "COMPLETED")
-        total_delay = sum(t.delay_minutes for t in self.trains)
-        
-        results["final_statistics"] = {
-            "completed_trains": completed_trains,
-            "completion_rate": completed_trains / len(self.trains) * 100,
-            "average_delay_minutes": total_delay / len(self.trains) if self.trains else 0,
-            "total_delay_hours": total_delay / 60,
-            "final_time": network_state.timestamp.isoformat()
-        }
-        
-        return results
-    
-    def simulate_disruption(self, section_id: str) -> Dict[str, any]:
-        """Simulates a disruption in a specific section"""
-        
-        # Find the section
-        disrupted_section = None
-        for section in self.sections:
-            if section.id == section_id:
-                disrupted_section = section
-                break
-        
-        if not disrupted_section:
-            return {"error": f"Section {section_id} not found"}
-        
-        # Mark section as blocked
-        disrupted_section.is_blocked = True
-        
-        # Create network state
-        network_state = NetworkState(
-            timestamp=self.current_time,
-            stations=self.stations,
-            sections=self.sections,
-            active_trains=self.schedules
-        )
-        
-        # Run optimizer to handle disruption
-        optimizer = TrainScheduleOptimizer(network_state)
-        result = optimizer.handle_disruption(disrupted_section)
-        
-        return {
-            "disrupted_section": section_id,
-            "affected_trains": len([
-                s for s in self.schedules 
-                if disrupted_section in s.route
-            ]),
-            "optimization_result": result.to_dict()
+"""
+Train Traffic Simulator
+Simulates train movements through the network for testing and validation
+"""
+
+import bisect
+import datetime
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from ai_kernels import advance_trains
+from models import (
+    Train, Section, Station, TrainSchedule, NetworkState,
+    TrainType, TrackType
+)
+from optimizer import TrainScheduleOptimizer
+
+# Shared unit timedelta: scaling this is cheaper than constructing a new
+# timedelta per station stop / per step
+_MINUTE = datetime.timedelta(minutes=1)
+
+
+class RailwayNetworkSimulator:
+    """Simulates train movements and network dynamics"""
+    
+    def __init__(self):
+        self.current_time = datetime.datetime.now()
+        self.stations = []
+        self.sections = []
+        self.trains = []
+        self.schedules = []
+        # Cached API payload rows - the static fields are serialized once
+        # instead of re-reading ~6 attributes per object per request
+        self._station_rows = None
+        self._section_static = None
+        self._train_static = None
+        self._priority_keys = None
+        self._priority_sorted_ids = None
+        self._trains_by_id = None
+        # (from_station.id, to_station.id) -> Section, for O(1) route builds
+        self._section_by_endpoints = {}
+        # section id -> schedules routed through it, so disruption impact
+        # is an index read instead of a containment scan per schedule
+        self._schedules_using = {}
+        # SoA views of the immutable hot fields (train speeds, section
+        # geometry) so the step kernel gathers from flat arrays instead of
+        # chasing object attributes per train per step
+        self._train_index = {}
+        self._train_speed = np.empty(0)
+        self._sec_index = {}
+        self._sec_length = np.empty(0)
+        self._sec_from_km = np.empty(0)
+        # Schedule counts per status, maintained on every transition so
+        # the simulation loop reads them instead of rescanning schedules
+        self._status_counts = {
+            'SCHEDULED': 0, 'RUNNING': 0, 'DELAYED': 0, 'COMPLETED': 0
+        }
+        # Schedules partitioned by simulation phase, so each step only
+        # walks trains that can actually do something: not-yet-departed
+        # trains wait in _pending and finished ones drop out entirely
+        self._pending = []
+        self._active = []
+        # Trains that progressed to a new section since the last re-solve;
+        # run_simulation hands this to the optimizer's warm_restart so an
+        # unchanged network skips the solve entirely
+        self._dirty = set()
+        # Bumped on every state mutation; lets the API layer answer repeat
+        # polls with 304 Not Modified instead of rebuilding the payload
+        self.version = 0
+        
+    def create_sample_network(self):
+        """Creates a sample railway network for demonstration"""
+
+        # One batched draw for all section gradients instead of a Python
+        # random call per section
+        rng = np.random.default_rng()
+
+        # Create stations along a route
+        station_data = [
+            ("STN01", "Delhi Junction", 0, 4, True),
+            ("STN02", "Ghaziabad", 25, 3, False),
+            ("STN03", "Meerut", 70, 2, True),
+            ("STN04", "Muzaffarnagar", 120, 2, False),
+            ("STN05", "Saharanpur", 165, 3, True),
+        ]
+        
+        for sid, name, pos, platforms, has_loop in station_data:
+            station = Station(
+                id=sid,
+                name=name,
+                platform_count=platforms,
+                position_km=pos,
+                has_loop_line=has_loop
+            )
+            self.stations.append(station)
+        
+        # Create sections between stations
+        gradients = rng.uniform(-0.5, 0.5, size=len(self.stations) - 1)
+        for i in range(len(self.stations) - 1):
+            from_station = self.stations[i]
+            to_station = self.stations[i + 1]
+            
+            # Vary track types for complexity
+            if i % 2 == 0:
+                track_type = TrackType.SINGLE
+            else:
+                track_type = TrackType.DOUBLE
+            
+            section = Section(
+                id=f"SEC{i+1:02d}",
+                from_station=from_station,
+                to_station=to_station,
+                length_km=to_station.position_km - from_station.position_km,
+                track_type=track_type,
+                speed_limit_kmph=100 if track_type == TrackType.DOUBLE else 80,
+                gradient=gradients[i]
+            )
+            self.sections.append(section)
+        
+        # Create reverse sections for double tracks
+        for i, section in enumerate(list(self.sections)):
+            if section.track_type == TrackType.DOUBLE:
+                reverse_section = Section(
+                    id=f"SEC{i+1:02d}R",
+                    from_station=section.to_station,
+                    to_station=section.from_station,
+                    length_km=section.length_km,
+                    track_type=section.track_type,
+                    speed_limit_kmph=section.speed_limit_kmph,
+                    gradient=-section.gradient
+                )
+                self.sections.append(reverse_section)
+
+        # Index sections by endpoint pair so route construction does a
+        # dict lookup per hop instead of scanning the section list
+        self._section_by_endpoints = {
+            (s.from_station.id, s.to_station.id): s for s in self.sections
+        }
+
+        # Section geometry never changes after creation; lay it out once
+        n_sections = len(self.sections)
+        self._sec_index = {s.id: i for i, s in enumerate(self.sections)}
+        self._sec_length = np.fromiter(
+            (s.length_km for s in self.sections), np.float64, n_sections)
+        self._sec_from_km = np.fromiter(
+            (s.from_station.position_km for s in self.sections), np.float64, n_sections)
+    
+    def station_payload(self) -> List[Dict]:
+        """Station rows for the status API - static after network creation"""
+        if self._station_rows is None:
+            self._station_rows = [
+                {'id': s.id, 'name': s.name, 'positionkm': s.position_km,
+                 'platforms': s.platform_count, 'hasloop': s.has_loop_line}
+                for s in self.stations
+            ]
+        return self._station_rows
+
+    def section_payload(self) -> List[Dict]:
+        """Section rows for the status API; only is_blocked is dynamic"""
+        if self._section_static is None:
+            self._section_static = [
+                {'id': s.id, 'from': s.from_station.name, 'to': s.to_station.name,
+                 'lengthkm': s.length_km, 'tracktype': s.track_type.name,
+                 'capacity': s.capacity}
+                for s in self.sections
+            ]
+        return [{**row, 'isblocked': s.is_blocked}
+                for row, s in zip(self._section_static, self.sections)]
+
+    def train_payload(self) -> List[Dict]:
+        """Train rows for the status API; only position/delay are dynamic"""
+        if self._train_static is None:
+            self._train_static = [
+                {'id': t.id, 'name': t.name, 'type': t.train_type.name,
+                 'priority': t.priority, 'speed': t.max_speed_kmph,
+                 'origin': t.origin.name, 'destination': t.destination.name,
+                 'departure': t.scheduled_departure.isoformat()}
+                for t in self.trains
+            ]
+        return [{**row, 'position': t.current_position, 'delay': t.delay_minutes}
+                for row, t in zip(self._train_static, self.trains)]
+
+    @property
+    def trains_by_id(self) -> Dict[str, Train]:
+        """Lazily built id -> Train index for O(1) lookups"""
+        if self._trains_by_id is None:
+            self._trains_by_id = {t.id: t for t in self.trains}
+        return self._trains_by_id
+
+    def trains_at_or_above_priority(self, priority: int) -> List[str]:
+        """IDs of trains whose priority is >= the given value.
+
+        Served from a lazily built priority-sorted index so cascade
+        queries are a bisect plus a slice instead of a full train scan.
+        """
+        if self._priority_keys is None:
+            order = sorted(self.trains, key=lambda t: t.priority)
+            self._priority_keys = [t.priority for t in order]
+            self._priority_sorted_ids = [t.id for t in order]
+        idx = bisect.bisect_left(self._priority_keys, priority)
+        return self._priority_sorted_ids[idx:]
+
+    def create_sample_trains(self, num_trains: int = 5):
+        """Creates sample trains with different characteristics"""
+        
+        train_types = [
+            (TrainType.SUPERFAST_EXPRESS, "Rajdhani Express", 160),
+            (TrainType.EXPRESS, "Shatabdi Express", 140),
+            (TrainType.PASSENGER, "Passenger", 100),
+            (TrainType.LOCAL, "Local", 80),
+            (TrainType.FREIGHT, "Freight", 60),
+        ]
+
+        # Batch every random attribute up front - one vectorized draw per
+        # column instead of per-train calls into the random module. The
+        # destination draw takes the origin array as its per-element lower
+        # bound, preserving origin < destination
+        rng = np.random.default_rng()
+        lengths = rng.integers(200, 601, size=num_trains)
+        dep_offsets = rng.integers(0, 61, size=num_trains)
+        origin_idxs = rng.integers(0, len(self.stations) - 1, size=num_trains)
+        dest_idxs = rng.integers(origin_idxs + 1, len(self.stations))
+
+        for i in range(num_trains):
+            train_type, base_name, speed = train_types[i % len(train_types)]
+
+            origin_idx = int(origin_idxs[i])
+            dest_idx = int(dest_idxs[i])
+            
+            train = Train(
+                id=f"TRN{i+1:03d}",
+                name=f"{base_name} {i+1:02d}",
+                train_type=train_type,
+                max_speed_kmph=speed,
+                length_meters=int(lengths[i]),
+                scheduled_departure=self.current_time + int(dep_offsets[i]) * _MINUTE,
+                origin=self.stations[origin_idx],
+                destination=self.stations[dest_idx],
+                current_position=self.stations[origin_idx].position_km
+            )
+            self.trains.append(train)
+            
+            # Create schedule for the train
+            route = []
+            for j in range(origin_idx, dest_idx):
+                # Look up the section connecting these stations
+                section = self._section_by_endpoints.get(
+                    (self.stations[j].id, self.stations[j + 1].id))
+                if section is not None:
+                    route.append(section)
+            
+            # Generate station stops. Arrival offsets come from one
+            # cumulative sum over the route's travel times plus the
+            # two-minute dwell at each intermediate station, instead of
+            # accumulating minute by minute through the loop
+            travel_mins = np.fromiter(
+                (section.length_km for section in route), np.float64, len(route)
+            ) * (60.0 / train.max_speed_kmph)
+            arrival_offsets = np.concatenate(([0.0], np.cumsum(travel_mins + 2.0)))
+
+            station_stops = []
+            for j, offset in zip(range(origin_idx, dest_idx + 1),
+                                 arrival_offsets.tolist()):
+                arrival_time = train.scheduled_departure + offset * _MINUTE
+                # Add stop time at intermediate stations
+                stop_duration = 2 if j != dest_idx else 0
+                station_stops.append((
+                    self.stations[j],
+                    arrival_time,
+                    arrival_time + stop_duration * _MINUTE
+                ))
+            
+            schedule = TrainSchedule(
+                train=train,
+                route=route,
+                station_stops=station_stops
+            )
+            self.schedules.append(schedule)
+            self._pending.append(schedule)
+            self._status_counts['SCHEDULED'] += 1
+            for section in route:
+                self._schedules_using.setdefault(section.id, []).append(schedule)
+        
+        # New trains invalidate the cached payload rows and train indexes
+        self._train_static = None
+        self._priority_keys = None
+        self._trains_by_id = None
+        self._train_index = {t.id: i for i, t in enumerate(self.trains)}
+        self._train_speed = np.fromiter(
+            (t.max_speed_kmph for t in self.trains), np.float64, len(self.trains))
+        self.version += 1
+
+    def _set_status(self, schedule: TrainSchedule, status: str):
+        """Change a schedule's status, keeping the counters in step"""
+        self._status_counts[schedule.status] -= 1
+        self._status_counts[status] += 1
+        schedule.status = status
+
+    def simulate_step(self, network_state: NetworkState, time_step_minutes: int = 5):
+        """Simulates one time step of train movements"""
+        
+        network_state.timestamp += time_step_minutes * _MINUTE
+        self.version += 1
+        
+        # Promote pending schedules whose departure time has passed;
+        # everything still pending is skipped wholesale this step
+        still_pending = []
+        for schedule in self._pending:
+            if network_state.timestamp < schedule.train.scheduled_departure:
+                still_pending.append(schedule)
+            else:
+                if schedule.status == "SCHEDULED":
+                    self._set_status(schedule, "RUNNING")
+                self._active.append(schedule)
+        self._pending = still_pending
+
+        # Stateful pass over the active schedules only: statuses, journey
+        # completion and section availability stay in Python; trains
+        # cleared to move are collected so their physics runs as one
+        # kernel call below
+        movers = []
+        still_active = []
+        for schedule in self._active:
+            train = schedule.train
+
+            # Check if train completed its journey; finished schedules
+            # leave the active partition for good
+            if schedule.current_section_index >= len(schedule.route):
+                if schedule.status != "COMPLETED":
+                    self._set_status(schedule, "COMPLETED")
+                continue
+            still_active.append(schedule)
+
+            current_section = schedule.route[schedule.current_section_index]
+
+            # Check if section is available
+            if network_state.is_section_available(current_section, train):
+                movers.append((schedule, current_section))
+            else:
+                # Train is delayed due to section being occupied
+                train.delay_minutes += time_step_minutes
+                if schedule.status != "DELAYED":
+                    self._set_status(schedule, "DELAYED")
+        self._active = still_active
+
+        if not movers:
+            return
+
+        # Numeric pass: advance every cleared train in one kernel call.
+        # Speeds and section geometry come from the prebuilt SoA arrays;
+        # only the mutable positions are read off the objects
+        n_movers = len(movers)
+        positions = np.fromiter(
+            (s.train.current_position for s, _ in movers), np.float64, n_movers)
+        train_rows = np.fromiter(
+            (self._train_index[s.train.id] for s, _ in movers), np.intp, n_movers)
+        sec_rows = np.fromiter(
+            (self._sec_index[sec.id] for _, sec in movers), np.intp, n_movers)
+        new_positions, completed = advance_trains(
+            positions, self._train_speed[train_rows],
+            self._sec_length[sec_rows], self._sec_from_km[sec_rows],
+            time_step_minutes)
+
+        # Write the results back into the objects and the occupancy state
+        for (schedule, current_section), new_position, done in zip(
+                movers, new_positions.tolist(), completed.tolist()):
+            train = schedule.train
+            if done:
+                # Train completes the section
+                train.current_position = current_section.to_station.position_km
+                network_state.update_train_position(schedule, None)
+                schedule.current_section_index += 1
+                self._dirty.add(train.id)
+
+                # Move to next section if available
+                if schedule.current_section_index < len(schedule.route):
+                    next_section = schedule.route[schedule.current_section_index]
+                    if network_state.is_section_available(next_section, train):
+                        network_state.update_train_position(schedule, next_section)
+            else:
+                # Train continues in current section
+                train.current_position = new_position
+                if current_section.id not in network_state.section_occupancy:
+                    network_state.update_train_position(schedule, current_section)
+    
+    def run_simulation(self, duration_hours: int = 4) -> Dict[str, any]:
+        """Runs the simulation for specified duration"""
+        
+        # Initialize network state
+        network_state = NetworkState(
+            timestamp=self.current_time,
+            stations=self.stations,
+            sections=self.sections,
+            active_trains=self.schedules
+        )
+        
+        # Initialize optimizer
+        optimizer = TrainScheduleOptimizer(network_state)
+        
+        # Run initial optimization
+        optimization_result = optimizer.optimize_schedule()
+        
+        # Simulation results
+        results = {
+            "start_time": self.current_time,
+            "duration_hours": duration_hours,
+            "total_trains": len(self.trains),
+            "optimization": optimization_result.to_dict(),
+            "events": [],
+            "final_statistics": {}
+        }
+        
+        # Run simulation steps
+        steps = (duration_hours * 60) // 5  # 5-minute steps
+        
+        for step in range(steps):
+            if step % 12 == 0:  # Log every hour
+                # The status counters are maintained by simulate_step, so
+                # logging reads them instead of rescanning every schedule
+                event = {
+                    "time": network_state.timestamp.isoformat(),
+                    "running_trains": self._status_counts['RUNNING'],
+                    "delayed_trains": self._status_counts['DELAYED'],
+                    # The counts are maintained by update_train_position,
+                    # so logging copies them instead of sizing every set
+                    "section_occupancy": dict(network_state.section_occupancy_counts)
+                }
+                results["events"].append(event)
+            
+            # Simulate train movements
+            self.simulate_step(network_state, 5)
+            
+            # Re-optimize every 30 minutes, but only when trains actually
+            # progressed - warm_restart returns the cached result otherwise
+            if step % 6 == 0 and step > 0:
+                optimization_result = optimizer.warm_restart(self._dirty)
+                self._dirty.clear()
+
+                # Apply optimization recommendations
+                # (In real system, this would update train controls)
+        
+        # Calculate final statistics
+        completed_trains = self._status_counts['COMPLETED']
+        total_delay = sum(t.delay_minutes for t in self.trains)
+        
+        results["final_statistics"] = {
+            "completed_trains": completed_trains,
+            "completion_rate": completed_trains / len(self.trains) * 100,
+            "average_delay_minutes": total_delay / len(self.trains) if self.trains else 0,
+            "total_delay_hours": total_delay / 60,
+            "final_time": network_state.timestamp.isoformat()
+        }
+        
+        return results
+    
+    def simulate_disruption(self, section_id: str) -> Dict[str, any]:
+        """Simulates a disruption in a specific section"""
+        
+        # Find the section
+        disrupted_section = None
+        for section in self.sections:
+            if section.id == section_id:
+                disrupted_section = section
+                break
+        
+        if not disrupted_section:
+            return {"error": f"Section {section_id} not found"}
+        self.version += 1
+        
+        # Mark section as blocked
+        disrupted_section.is_blocked = True
+        
+        # Create network state
+        network_state = NetworkState(
+            timestamp=self.current_time,
+            stations=self.stations,
+            sections=self.sections,
+            active_trains=self.schedules
+        )
+        
+        # Run optimizer to handle disruption
+        optimizer = TrainScheduleOptimizer(network_state)
+        result = optimizer.handle_disruption(disrupted_section)
+        
+        return {
+            "disrupted_section": section_id,
+            "affected_trains": len(self._schedules_using.get(section_id, ())),
+            "optimization_result": result.to_dict()
         }
\ No newline at end of file
@@ -1,74 +1,112 @@
 
 # time_series_analyzer.py - ADD THIS NEW AI COMPONENT
+import collections
+
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
-import json
+
+from ai_kernels import bucket_mean_sums, congestion_propagation
 
 class RailwayTimeSeriesAnalyzer:
     """AI-powered time series analysis for railway patterns"""
 
     def __init__(self):
-        self.historical_data = []
+        # Ring buffer: 24h of 30-second polls. maxlen bounds memory on
+        # long-running servers regardless of how fast dashboards poll
+        self.historical_data = collections.deque(maxlen=2880)
         self.patterns = {}
+        # Running congestion sums/counts per (day_of_week, hour) bucket;
+        # next-hour prediction reads one cell instead of filtering the
+        # whole ring buffer per call
+        self._grid_sum = np.zeros((7, 24))
+        self._grid_count = np.zeros((7, 24), dtype=np.int64)
 
     def add_operational_data(self, timestamp, trains_data, sections_data):
         """Add real-time operational data for pattern learning"""
+        # Utilization for every section in one vector divide - this runs on
+        # every live tick, so the per-section Python arithmetic adds up
+        n_sections = len(sections_data)
+        occupancy = np.fromiter((s.get('occupancy', 0) for s in sections_data),
+                                np.float64, n_sections)
+        capacity = np.fromiter((s.get('capacity', 1) for s in sections_data),
+                               np.float64, n_sections)
+        utilization = occupancy / np.maximum(capacity, 1.0)
+
         data_point = {
-            'timestamp': timestamp.isoformat(),
+            # Kept as a datetime: the expiry check below compares it
+            # directly, where the old ISO string was re-parsed per call
+            'timestamp': timestamp,
             'hour': timestamp.hour,
             'day_of_week': timestamp.weekday(),
             'total_trains': len(trains_data),
             'delayed_trains': sum(1 for t in trains_data if t.get('delay', 0) > 5),
             'avg_delay': sum(t.get('delay', 0) for t in trains_data) / len(trains_data) if trains_data else 0,
-            'section_utilization': {s['id']: s.get('occupancy', 0) / s.get('capacity', 1) 
-                                  for s in sections_data},
-            'peak_congestion': max([s.get('occupancy', 0) / s.get('capacity', 1) for s in sections_data], default=0)
+            'section_utilization': dict(zip((s['id'] for s in sections_data),
+                                            utilization.tolist())),
+            'peak_congestion': float(utilization.max()) if n_sections else 0
         }
 
+        # A full deque silently drops its leftmost entry on append, so
+        # settle that point's grid contribution first
+        if len(self.historical_data) == self.historical_data.maxlen:
+            dropped = self.historical_data[0]
+            self._grid_sum[dropped['day_of_week'], dropped['hour']] -= \
+                dropped['peak_congestion']
+            self._grid_count[dropped['day_of_week'], dropped['hour']] -= 1
+
         self.historical_data.append(data_point)
+        self._grid_sum[data_point['day_of_week'], data_point['hour']] += \
+            data_point['peak_congestion']
+        self._grid_count[data_point['day_of_week'], data_point['hour']] += 1
 
-        # Keep only last 7 days of data
+        # Keep only last 7 days of data - popping expired entries off the
+        # left is O(expired), not the old O(N) full-list rebuild per call.
+        # Evicted points also leave the congestion grid
         cutoff_time = timestamp - timedelta(days=7)
-        self.historical_data = [d for d in self.historical_data 
-                               if datetime.fromisoformat(d['timestamp']) > cutoff_time]
+        while (self.historical_data and
+               self.historical_data[0]['timestamp'] <= cutoff_time):
+            expired = self.historical_data.popleft()
+            self._grid_sum[expired['day_of_week'], expired['hour']] -= \
+                expired['peak_congestion']
+            self._grid_count[expired['day_of_week'], expired['hour']] -= 1
 
     def analyze_peak_patterns(self):
         """Identify peak traffic patterns using AI"""
         if len(self.historical_data) < 10:
             return {"status": "Insufficient data for pattern analysis"}
 
-        df = pd.DataFrame(self.historical_data)
+        # Pull the numeric columns out once; the grouping and scan loops
+        # below run as compiled kernels over these arrays instead of
+        # row-wise DataFrame access
+        n = len(self.historical_data)
+        hours = np.fromiter((d['hour'] for d in self.historical_data), np.int64, n)
+        days = np.fromiter((d['day_of_week'] for d in self.historical_data), np.int64, n)
+        delays = np.fromiter((d['avg_delay'] for d in self.historical_data), np.float64, n)
+        congestion = np.fromiter((d['peak_congestion'] for d in self.historical_data), np.float64, n)
 
         # Peak hour analysis
-        hourly_delays = df.groupby('hour')['avg_delay'].mean()
-        peak_hours = hourly_delays[hourly_delays > hourly_delays.mean() + hourly_delays.std()].index.tolist()
+        hour_sums, hour_counts = bucket_mean_sums(hours, delays, 24)
+        seen_hours = np.flatnonzero(hour_counts)
+        hourly_delays = hour_sums[seen_hours] / hour_counts[seen_hours]
+        peak_cutoff = hourly_delays.mean() + hourly_delays.std(ddof=1)
+        peak_hours = seen_hours[hourly_delays > peak_cutoff].tolist()
 
         # Day of week patterns
-        daily_congestion = df.groupby('day_of_week')['peak_congestion'].mean()
-        busy_days = daily_congestion[daily_congestion > daily_congestion.mean()].index.tolist()
+        day_sums, day_counts = bucket_mean_sums(days, congestion, 7)
+        seen_days = np.flatnonzero(day_counts)
+        daily_congestion = day_sums[seen_days] / day_counts[seen_days]
+        busy_days = seen_days[daily_congestion > daily_congestion.mean()].tolist()
 
         # Congestion propagation patterns
-        congestion_correlation = {}
-        for i in range(len(df) - 1):
-            current_congestion = df.iloc[i]['peak_congestion']
-            next_congestion = df.iloc[i + 1]['peak_congestion']
-
-            if current_congestion > 0.7:  # High congestion threshold
-                if next_congestion > current_congestion:
-                    congestion_correlation['propagates'] = congestion_correlation.get('propagates', 0) + 1
-                else:
-                    congestion_correlation['dissipates'] = congestion_correlation.get('dissipates', 0) + 1
+        propagates, dissipates = congestion_propagation(congestion, 0.7)
 
         patterns = {
             "peak_hours": peak_hours,
             "busy_days": [["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"][d] 
                          for d in busy_days],
-            "average_delay_by_hour": {str(hour): delay for hour, delay in hourly_delays.items()},
-            "congestion_propagation_rate": (
-                congestion_correlation.get('propagates', 0) / 
-                max(sum(congestion_correlation.values()), 1) * 100
-            ),
+            "average_delay_by_hour": {str(hour): delay for hour, delay
+                                      in zip(seen_hours.tolist(), hourly_delays.tolist())},
+            "congestion_propagation_rate": propagates / max(propagates + dissipates, 1) * 100,
             "recommendations": self._generate_pattern_recommendations(peak_hours, busy_days)
         }
 
@@ -104,15 +142,13 @@ class RailwayTimeSeriesAnalyzer:
         current_hour = current_time.hour
         current_day = current_time.weekday()
 
-        # Simple pattern-based prediction
-        similar_periods = [
-            d for d in self.historical_data 
-            if d['hour'] == current_hour and d['day_of_week'] == current_day
-        ]
+        # Simple pattern-based prediction: one cell of the running grid
+        # replaces a linear filter over the whole ring buffer
+        samples = int(self._grid_count[current_day, current_hour])
 
-        if similar_periods:
-            avg_congestion = sum(d['peak_congestion'] for d in similar_periods) / len(similar_periods)
-            confidence = min(len(similar_periods) / 5.0, 1.0)  # Max confidence at 5+ similar periods
+        if samples:
+            avg_congestion = float(self._grid_sum[current_day, current_hour]) / samples
+            confidence = min(samples / 5.0, 1.0)  # Max confidence at 5+ similar periods
 
             if avg_congestion > 0.8:
                 prediction = "high"
@@ -125,7 +161,7 @@ class RailwayTimeSeriesAnalyzer:
                 "prediction": prediction,
                 "confidence": confidence,
                 "expected_congestion": avg_congestion,
-                "based_on_samples": len(similar_periods)
+                "based_on_samples": samples
             }
         else:
             return {"prediction": "unknown", "confidence": 0}
@@ -135,15 +171,22 @@ class RailwayTimeSeriesAnalyzer:
         if len(self.historical_data) < 20:
             return {"status": "Insufficient data for anomaly detection"}
 
-        df = pd.DataFrame(self.historical_data[-20:])  # Last 20 data points
+        # Pull the two numeric columns straight into arrays - building
+        # DataFrames here just to take four means paid a full
+        # Python-to-pandas conversion per call
+        n = len(self.historical_data)
+        delays = np.fromiter((d['avg_delay'] for d in self.historical_data),
+                             np.float64, n)
+        congestion = np.fromiter((d['peak_congestion'] for d in self.historical_data),
+                                 np.float64, n)
 
         # Calculate recent averages
-        recent_avg_delay = df['avg_delay'].mean()
-        recent_avg_congestion = df['peak_congestion'].mean()
+        recent_avg_delay = float(delays[-20:].mean())
+        recent_avg_congestion = float(congestion[-20:].mean())
 
         # Compare with historical averages
-        historical_avg_delay = pd.DataFrame(self.historical_data[:-20])['avg_delay'].mean() if len(self.historical_data) > 20 else recent_avg_delay
-        historical_avg_congestion = pd.DataFrame(self.historical_data[:-20])['peak_congestion'].mean() if len(self.historical_data) > 20 else recent_avg_congestion
+        historical_avg_delay = float(delays[:-20].mean()) if n > 20 else recent_avg_delay
+        historical_avg_congestion = float(congestion[:-20].mean()) if n > 20 else recent_avg_congestion
 
         anomalies = []
 
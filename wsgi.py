@@ -0,0 +1,3 @@
+# wsgi.py - WSGI entry point for production servers
+# Run with: gunicorn -c gunicorn.conf.py wsgi:app
+from app_enhanced_live import app  # noqa: F401